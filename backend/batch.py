@@ -0,0 +1,190 @@
+"""
+Headless batch processing for directories of videos.
+
+Usage:
+    python -m backend.batch data/archive/ --output-dir data/processed/archive --workers 4
+    python -m backend.batch "data/archive/**/*.mp4" --workers 2
+
+Finished files are recorded in a manifest so an interrupted run can be resumed.
+"""
+import os
+import sys
+import json
+import glob
+import time
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from . import config
+from .profiles import get_profile
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.m4v')
+
+# One VideoProcessor per worker process, created by _init_worker
+_processor = None
+
+_profile = None
+
+def _init_worker(profile):
+    global _processor, _profile
+    from .processor import VideoProcessor
+    _processor = VideoProcessor()
+    _processor.initialize()
+    _profile = profile
+
+def _process_one(input_path, output_path):
+    """Run a single file in a worker process and return its result record"""
+    start = time.time()
+    try:
+        stats = _processor.process_video(input_path, output_path, profile=_profile)
+        return {
+            'input': input_path,
+            'output': output_path,
+            'status': 'completed',
+            'frames': stats['frames'],
+            'elapsed': round(stats['elapsed'], 3),
+            'fps': round(stats['fps'], 2)
+        }
+    except Exception as e:
+        return {
+            'input': input_path,
+            'output': output_path,
+            'status': 'failed',
+            'error': str(e),
+            'elapsed': round(time.time() - start, 3)
+        }
+
+def collect_inputs(sources):
+    """Expand directories and glob patterns into a sorted list of video files"""
+    files = set()
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, names in os.walk(source):
+                for name in names:
+                    if name.lower().endswith(VIDEO_EXTENSIONS):
+                        files.add(os.path.abspath(os.path.join(root, name)))
+        else:
+            for match in glob.glob(source, recursive=True):
+                if os.path.isfile(match) and match.lower().endswith(VIDEO_EXTENSIONS):
+                    files.add(os.path.abspath(match))
+    return sorted(files)
+
+def _file_key(path, profile_name):
+    """Identify an input by path, size, mtime and profile so changed files or settings are reprocessed"""
+    st = os.stat(path)
+    return f"{path}:{st.st_size}:{int(st.st_mtime)}:{profile_name}"
+
+def load_manifest(manifest_path):
+    """Read completed entries from a JSON-lines manifest"""
+    done = {}
+    if not os.path.exists(manifest_path):
+        return done
+    with open(manifest_path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Tolerate a truncated last line from an interrupted run
+                continue
+            if record.get('status') == 'completed':
+                done[record['key']] = record
+    return done
+
+def output_path_for(input_path, output_dir, profile_name):
+    """
+    Stable output name; the path digest keeps same-named clips from different folders apart,
+    and the profile keeps runs with different profiles from overwriting each other
+    """
+    digest = hashlib.sha1(input_path.encode()).hexdigest()[:8]
+    return str(Path(output_dir) / f"processed_{Path(input_path).stem}_{profile_name}_{digest}.mp4")
+
+def run_batch(sources, output_dir, workers=1, manifest_path=None, summary_path=None, force=False, profile=None):
+    """Process all matching inputs across a worker pool and write a summary"""
+    profile = get_profile(profile or config.DEFAULT_PROFILE)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = manifest_path or os.path.join(output_dir, "manifest.jsonl")
+    summary_path = summary_path or os.path.join(output_dir, "summary.json")
+
+    inputs = collect_inputs(sources)
+    done = {} if force else load_manifest(manifest_path)
+
+    pending = []
+    skipped = []
+    for path in inputs:
+        key = _file_key(path, profile.name)
+        record = done.get(key)
+        if record and os.path.exists(record['output']):
+            skipped.append(record)
+        else:
+            pending.append((key, path, output_path_for(path, output_dir, profile.name)))
+
+    logger.info(f"Found {len(inputs)} videos: {len(pending)} to process, {len(skipped)} already done")
+
+    results = []
+    batch_start = time.time()
+    with open(manifest_path, "a") as manifest, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(profile,)) as pool:
+        futures = {pool.submit(_process_one, path, out): key for key, path, out in pending}
+        for future in as_completed(futures):
+            record = future.result()
+            record['key'] = futures[future]
+            results.append(record)
+            # Flush each record so progress survives a crash
+            manifest.write(json.dumps(record) + "\n")
+            manifest.flush()
+
+            if record['status'] == 'completed':
+                logger.info(f"[{len(results)}/{len(pending)}] {record['input']}: "
+                            f"{record['frames']} frames at {record['fps']:.1f} FPS")
+            else:
+                logger.error(f"[{len(results)}/{len(pending)}] {record['input']} failed: {record['error']}")
+
+    wall_time = time.time() - batch_start
+    completed = [r for r in results if r['status'] == 'completed']
+    total_frames = sum(r['frames'] for r in completed)
+    summary = {
+        'inputs': len(inputs),
+        'processed': len(completed),
+        'failed': len(results) - len(completed),
+        'skipped': len(skipped),
+        'workers': workers,
+        'profile': profile.name,
+        'wall_time': round(wall_time, 3),
+        'total_frames': total_frames,
+        'throughput_fps': round(total_frames / wall_time, 2) if wall_time > 0 else 0.0,
+        'files': sorted(results, key=lambda r: r['input'])
+    }
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
+
+    logger.info(f"Batch done: {summary['processed']} processed, {summary['failed']} failed, "
+                f"{summary['skipped']} skipped, {summary['throughput_fps']} FPS overall -> {summary_path}")
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless batch processing for Road Vision')
+    parser.add_argument('inputs', nargs='+', help='Input directories or glob patterns')
+    parser.add_argument('--output-dir', type=str, default=str(config.OUTPUT_DIR / "batch"), help='Directory for processed videos')
+    parser.add_argument('--workers', type=int, default=config.BATCH_WORKERS, help='Number of worker processes')
+    parser.add_argument('--manifest', type=str, help='Manifest path (default: <output-dir>/manifest.jsonl)')
+    parser.add_argument('--summary', type=str, help='Summary path (default: <output-dir>/summary.json)')
+    parser.add_argument('--force', action='store_true', help='Ignore the manifest and reprocess everything')
+    parser.add_argument('--profile', type=str, default=config.DEFAULT_PROFILE, choices=list(config.PROCESSING_PROFILES), help='Processing profile')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    summary = run_batch(args.inputs, args.output_dir, workers=args.workers,
+                        manifest_path=args.manifest, summary_path=args.summary, force=args.force,
+                        profile=args.profile)
+    return 1 if summary['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
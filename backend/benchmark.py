@@ -0,0 +1,246 @@
+"""
+Speed/accuracy trade-off harness.
+
+Runs VideoProcessor once in a reference configuration and once per candidate
+configuration on the same inputs, then reports throughput next to accuracy
+deltas against the reference run.
+The reference analyses every frame at full resolution (DEFAULT_REFERENCE plus
+--reference overrides); candidates run the production defaults in backend.config
+with only their own overrides applied.
+
+Usage:
+    python -m backend.benchmark data/sample_videos/*.mp4 --candidates candidates.json --report report.json
+
+candidates.json maps a name to config overrides, e.g.
+    {"proxy_640": {"PROXY_ANALYSIS_WIDTH": 640},
+     "int8": {"YOLO_MODEL_PATH": "data/models/yolov8n_int8.onnx"},
+     "fast": {"profile": "fast"}}
+The "profile" key selects a named processing profile for that run.
+"""
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import tempfile
+from contextlib import contextmanager
+import numpy as np
+from . import config
+from .profiles import get_profile
+from .utils import calculate_metrics
+
+logger = logging.getLogger(__name__)
+
+# Reference run only: full-resolution analysis of every frame
+DEFAULT_REFERENCE = {
+    'PROXY_ANALYSIS_WIDTH': None,
+    'PROCESSING_SKIP_FRAMES': 1,
+    'STATIC_SCENE_REUSE': False,
+    'USE_INFERENCE_SERVER': False
+}
+
+@contextmanager
+def override_config(overrides):
+    """Temporarily replace module-level settings in backend.config"""
+    unknown = [key for key in overrides if not hasattr(config, key)]
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(unknown)}")
+    saved = {key: getattr(config, key) for key in overrides}
+    try:
+        for key, value in overrides.items():
+            setattr(config, key, value)
+        yield
+    finally:
+        for key, value in saved.items():
+            setattr(config, key, value)
+
+def run_configuration(input_path, overrides, work_dir):
+    """Process one input under the given overrides; returns (stats, per-frame records)"""
+    from .processor import VideoProcessor
+    from .inference_server import InferenceServer
+
+    records = []
+    overrides = dict(overrides)
+    profile_name = overrides.pop('profile', None)
+    with override_config(overrides):
+        # Resolved inside the override so profiles pick up overridden defaults
+        profile = get_profile(profile_name) if profile_name else None
+        # A private model (and server) per run, so overrides like YOLO_MODEL_PATH take effect;
+        # the process-wide server would keep whichever model it loaded first
+        server = InferenceServer() if config.USE_INFERENCE_SERVER else None
+        processor = VideoProcessor(server)
+        output_path = os.path.join(work_dir, "output.mp4")
+        try:
+            stats = processor.process_video(
+                input_path, output_path,
+                frame_callback=lambda i, record: records.append(record),
+                profile=profile
+            )
+        finally:
+            if server is not None:
+                server.close()
+    return stats, records
+
+def box_iou(a, b):
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def match_detections(reference, candidate, iou_threshold):
+    """Greedy same-class matching by IoU; returns the IoUs of matched pairs"""
+    pairs = []
+    for i, ref in enumerate(reference):
+        for j, cand in enumerate(candidate):
+            if ref['class'] == cand['class']:
+                iou = box_iou(ref['bbox'], cand['bbox'])
+                if iou >= iou_threshold:
+                    pairs.append((iou, i, j))
+
+    used_ref, used_cand, ious = set(), set(), []
+    for iou, i, j in sorted(pairs, reverse=True):
+        if i not in used_ref and j not in used_cand:
+            used_ref.add(i)
+            used_cand.add(j)
+            ious.append(iou)
+    return ious
+
+def source_metrics(record, frame_size):
+    """Offset and curvature from a record's source-pixel fits, whatever resolution it was analysed at"""
+    width, height = frame_size
+    return calculate_metrics(
+        {'left_fit': np.array(record['left_fit']), 'right_fit': np.array(record['right_fit'])},
+        (height, width)
+    )
+
+def compare_records(reference, candidate, frame_size, iou_threshold=None):
+    """Per-input accuracy of a candidate run relative to the reference run; frame_size is the source (w, h)"""
+    iou_threshold = config.BENCHMARK_IOU_THRESHOLD if iou_threshold is None else iou_threshold
+
+    ref_boxes = cand_boxes = 0
+    matched_ious = []
+    coeff_deltas, offset_deltas, curvature_errors = [], [], []
+    ref_lane_frames = both_lane_frames = 0
+
+    for ref, cand in zip(reference, candidate):
+        ref_boxes += len(ref['detections'])
+        cand_boxes += len(cand['detections'])
+        matched_ious.extend(match_detections(ref['detections'], cand['detections'], iou_threshold))
+
+        if ref['left_fit'] is None:
+            continue
+        ref_lane_frames += 1
+        if cand['left_fit'] is None:
+            continue
+        both_lane_frames += 1
+        coeff_deltas.append(np.abs(np.array(ref['left_fit'] + ref['right_fit']) -
+                                   np.array(cand['left_fit'] + cand['right_fit'])))
+        ref_metrics, cand_metrics = source_metrics(ref, frame_size), source_metrics(cand, frame_size)
+        offset_deltas.append(abs(ref_metrics['offset'] - cand_metrics['offset']))
+        curvature_errors.append(abs(ref_metrics['curvature'] - cand_metrics['curvature']) /
+                                max(ref_metrics['curvature'], 1e-6))
+
+    coeff_deltas = np.array(coeff_deltas) if coeff_deltas else np.zeros((0, 6))
+    return {
+        'frames_compared': min(len(reference), len(candidate)),
+        'frame_count_mismatch': len(reference) != len(candidate),
+        'detection': {
+            'reference_boxes': ref_boxes,
+            'candidate_boxes': cand_boxes,
+            'matched': len(matched_ious),
+            'recall': len(matched_ious) / ref_boxes if ref_boxes else None,
+            'precision': len(matched_ious) / cand_boxes if cand_boxes else None,
+            'mean_iou': float(np.mean(matched_ious)) if matched_ious else None
+        },
+        'lane': {
+            'reference_frames': ref_lane_frames,
+            'matched_frames': both_lane_frames,
+            'coverage': both_lane_frames / ref_lane_frames if ref_lane_frames else None,
+            # Mean |delta| of [left a, b, c, right a, b, c] in source pixels
+            'coefficient_mae': coeff_deltas.mean(axis=0).tolist() if len(coeff_deltas) else None,
+            'offset_mae_m': float(np.mean(offset_deltas)) if offset_deltas else None,
+            'offset_p95_m': float(np.percentile(offset_deltas, 95)) if offset_deltas else None,
+            # Curvature radius explodes on straight roads, so report the median relative error
+            'curvature_median_rel_error': float(np.median(curvature_errors)) if curvature_errors else None
+        }
+    }
+
+def run_benchmark(inputs, candidates, reference=None, iou_threshold=None):
+    """Run reference and candidates on every input; returns a JSON-serialisable report"""
+    reference = {**DEFAULT_REFERENCE, **(reference or {})}
+    report = {'reference': reference, 'candidates': {}, 'inputs': []}
+    work_dir = tempfile.mkdtemp(prefix="roadvision_bench_")
+    try:
+        for input_path in inputs:
+            logger.info(f"Reference run: {input_path}")
+            ref_stats, ref_records = run_configuration(input_path, reference, work_dir)
+            entry = {
+                'input': input_path,
+                'reference': {'frames': ref_stats['frames'], 'fps': ref_stats['fps']},
+                'candidates': {}
+            }
+            for name, overrides in candidates.items():
+                logger.info(f"Candidate '{name}': {input_path}")
+                # Production defaults plus the candidate's overrides, not the reference settings
+                stats, records = run_configuration(input_path, overrides, work_dir)
+                entry['candidates'][name] = {
+                    'fps': stats['fps'],
+                    'speedup': stats['fps'] / ref_stats['fps'] if ref_stats['fps'] else None,
+                    **compare_records(ref_records, records, ref_stats['source_size'], iou_threshold)
+                }
+            report['inputs'].append(entry)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Aggregate per candidate: detection rates pool boxes, lane offset MAE is weighted by
+    # matched lane frames, throughput is averaged per input
+    for name, overrides in candidates.items():
+        runs = [entry['candidates'][name] for entry in report['inputs']]
+        ref_fps = [entry['reference']['fps'] for entry in report['inputs']]
+        ref_boxes = sum(r['detection']['reference_boxes'] for r in runs)
+        cand_boxes = sum(r['detection']['candidate_boxes'] for r in runs)
+        matched = sum(r['detection']['matched'] for r in runs)
+        lane_frames = sum(r['lane']['matched_frames'] for r in runs)
+        offset_error = sum(r['lane']['offset_mae_m'] * r['lane']['matched_frames']
+                           for r in runs if r['lane']['offset_mae_m'] is not None)
+        report['candidates'][name] = {
+            'overrides': overrides,
+            'mean_fps': float(np.mean([r['fps'] for r in runs])) if runs else None,
+            'mean_speedup': float(np.mean([r['fps'] for r in runs]) / np.mean(ref_fps)) if runs and np.mean(ref_fps) else None,
+            'detection_recall': matched / ref_boxes if ref_boxes else None,
+            'detection_precision': matched / cand_boxes if cand_boxes else None,
+            'lane_offset_mae_m': offset_error / lane_frames if lane_frames else None
+        }
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare fast processing modes against a reference run')
+    parser.add_argument('inputs', nargs='+', help='Input video paths')
+    parser.add_argument('--candidates', type=str, required=True, help='JSON file of {name: {CONFIG_KEY: value}}')
+    parser.add_argument('--reference', type=str, help='JSON file of reference config overrides')
+    parser.add_argument('--iou', type=float, default=config.BENCHMARK_IOU_THRESHOLD, help='IoU threshold for matching detections')
+    parser.add_argument('--report', type=str, default='benchmark_report.json', help='Output report path')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    with open(args.candidates) as f:
+        candidates = json.load(f)
+    reference = {}
+    if args.reference:
+        with open(args.reference) as f:
+            reference = json.load(f)
+
+    report = run_benchmark(args.inputs, candidates, reference, args.iou)
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for name, summary in report['candidates'].items():
+        logger.info(f"{name}: speedup={summary['mean_speedup']}, recall={summary['detection_recall']}, "
+                    f"offset MAE={summary['lane_offset_mae_m']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
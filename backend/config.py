@@ -1,16 +1,26 @@
 # Configuration for Mini Road-Sign Detector & Lane Predictor
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent  # Go up one level from backend to root
 DATA_DIR = BASE_DIR / "data"
 MODELS_DIR = DATA_DIR / "models"
 OUTPUT_DIR = DATA_DIR / "processed"
+UPLOAD_DIR = DATA_DIR / "uploads"
+PREVIEW_DIR = DATA_DIR / "previews"
+EVENTS_DIR = DATA_DIR / "events"
 
 # YOLO Model Configuration
 SIGN_CONFIDENCE_THRESHOLD = 0.6  # Increased from 0.5 to 60% for more reliable detections
 YOLO_MODEL_PATH = str(MODELS_DIR / "yolov8n.pt")
 TRAFFIC_SIGN_MODEL_PATH = YOLO_MODEL_PATH
 
+# Shared inference server (one model, dynamic batches across jobs)
+USE_INFERENCE_SERVER = True
+INFERENCE_MAX_BATCH_SIZE = 8
+INFERENCE_MAX_WAIT_MS = 10
+INFERENCE_CLIENT_IDLE_MS = 500  # Sessions with no frame for this long (paused, preempted) are not waited for
+
 # Confidence Level Thresholds for Color Coding
 CONFIDENCE_HIGH = 0.8    # 80%+ - Green
 CONFIDENCE_MEDIUM = 0.6  # 60-79% - Yellow
@@ -56,8 +66,93 @@ INITIAL_UNCERTAINTY = 1e3
 
 # Alert Thresholds
 LANE_OFFSET_THRESHOLD = 0.5  # meters
-CURVATURE_ALERT_THRESHOLD = 500
+CURVATURE_ALERT_THRESHOLD = 500  # meters, radii below this count as a sharp curve
+EVENT_MERGE_GAP_SECONDS = 0.5    # Re-triggers within this gap extend the same event
 
 # Video Processing
 TARGET_FPS = 30
 PROCESSING_SKIP_FRAMES = 1
+
+# Static-scene reuse (stopped vehicle): frames that barely differ from the last
+# analysed frame reuse its detections, lane fits and rendered lane layer
+STATIC_SCENE_REUSE = True
+STATIC_SCENE_THRESHOLD = 1.5     # Mean absolute grey-level difference (0-255) of the most changed block
+STATIC_SCENE_MAX_REUSE = 30      # Source frames an analysis may be reused for before a fresh one is forced
+STATIC_SCENE_SAMPLE_WIDTH = 64   # Thumbnail width used for the comparison
+STATIC_SCENE_BLOCK_SIZE = 8      # Block edge in thumbnail pixels; local motion is scored per block
+STATIC_REUSE_OVERLAY = True      # Also reuse the rendered lane layer while the fits are unchanged
+
+# Processing Profiles (overrides of the defaults above, selectable per job at upload)
+DEFAULT_PROFILE = "balanced"
+PROCESSING_PROFILES = {
+    'fast': {
+        'skip_frames': 3,
+        'proxy_width': 640,
+        'nwindows': 6,
+        'margin': 50,
+        'minpix': 25,
+        'min_lane_points': 50,
+        'static_threshold': 2.0,
+        'static_max_reuse': 60,
+    },
+    'balanced': {},
+    'accurate': {
+        'sign_confidence_threshold': 0.5,
+        'nwindows': 12,
+        'margin': 100,
+        'proxy_width': None,
+        'static_reuse': False,
+    },
+}
+
+# Resolution (widths in pixels, None keeps the source size)
+PROXY_ANALYSIS_WIDTH = None  # e.g. 1280 to run detection and lane fitting on a copy no wider than this
+OUTPUT_WIDTH = None          # e.g. 1920 to render 4K input as 1080p
+
+# Multi-process analysis within one job (shared-memory frame ring)
+PARALLEL_ANALYSIS = False
+ANALYSIS_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Each worker loads its own model
+FRAME_RING_SLOTS_PER_WORKER = 2
+FRAME_RING_MAX_PENDING = None    # Frames decoded ahead of the encoder, analysed or not (None = 2 x slots)
+ANALYSIS_START_METHOD = "spawn"  # fork is unsafe once torch has started threads
+
+# Output Encoding
+USE_FFMPEG_ENCODER = True   # Pipe frames to an ffmpeg subprocess when available
+FFMPEG_BINARY = "ffmpeg"
+ENCODER_CODEC = "libx264"
+ENCODER_PRESET = "veryfast"  # ultrafast ... veryslow
+ENCODER_CRF = 23             # Lower is better quality, larger file
+ENCODER_THREADS = 0          # 0 lets ffmpeg pick
+ENCODER_KEEP_AUDIO = True    # Keep the audio track from the source video
+ENCODER_AUDIO_CODEC = "aac"  # Transcoded, since source codecs like PCM are not valid in MP4
+ENCODER_AUDIO_BITRATE = "128k"
+OPENCV_FOURCC = "avc1"       # Fallback writer codec
+OPENCV_FALLBACK_FOURCC = "mp4v"  # Tried when the OpenCV build cannot encode OPENCV_FOURCC
+
+# Batch Processing
+BATCH_WORKERS = max(1, (os.cpu_count() or 2) // 2)  # Each worker loads its own model
+
+# Job Scheduling
+MAX_CONCURRENT_JOBS = 4   # Overlapping jobs share one model through the inference server
+JOB_PREEMPTION = True     # Higher-priority uploads pause lower-priority running jobs
+DEFAULT_JOB_PRIORITY = "normal"
+
+# Storage Lifecycle
+STORAGE_QUOTAS = {
+    str(UPLOAD_DIR): 5 * 1024**3,   # bytes
+    str(OUTPUT_DIR): 10 * 1024**3,
+}
+STORAGE_TTL_SECONDS = 24 * 3600     # Finished job files expire after a day (0 disables)
+STORAGE_SWEEP_INTERVAL = 300        # seconds between background sweeps
+
+# Previews (thumbnails, sprite sheet, poster)
+PREVIEW_INTERVAL_SECONDS = 2.0
+PREVIEW_MAX_THUMBNAILS = 200       # Interval widens on long videos to stay under this
+PREVIEW_THUMBNAIL_WIDTH = 160
+PREVIEW_POSTER_WIDTH = 640
+PREVIEW_POSTER_POSITION = 0.1      # Fraction of the video to take the poster from
+PREVIEW_SPRITE_COLUMNS = 10
+PREVIEW_JPEG_QUALITY = 80
+
+# Benchmark Harness
+BENCHMARK_IOU_THRESHOLD = 0.5  # Minimum IoU for a candidate box to match a reference box
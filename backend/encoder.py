@@ -0,0 +1,99 @@
+import cv2
+import shutil
+import logging
+import subprocess
+from . import config
+
+logger = logging.getLogger(__name__)
+
+class FFmpegWriter:
+    def __init__(self, output_path, fps, frame_size, audio_source=None):
+        """Pipe raw BGR frames to an ffmpeg subprocess for encoding"""
+        self.output_path = str(output_path)
+        width, height = frame_size
+
+        cmd = [
+            config.FFMPEG_BINARY, '-y', '-loglevel', 'error',
+            # Raw frames from stdin at the source frame rate
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-s', f"{width}x{height}", '-r', f"{fps}",
+            '-i', '-',
+        ]
+        if audio_source and config.ENCODER_KEEP_AUDIO:
+            # Transcode rather than copy: PCM audio from dashcam AVI/MOV cannot go into MP4 as-is
+            cmd += ['-i', str(audio_source), '-map', '0:v:0', '-map', '1:a?',
+                    '-c:a', config.ENCODER_AUDIO_CODEC, '-b:a', config.ENCODER_AUDIO_BITRATE, '-shortest']
+
+        cmd += [
+            # yuv420p needs even dimensions; pad odd-sized sources by one pixel
+            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+            '-c:v', config.ENCODER_CODEC,
+            '-preset', config.ENCODER_PRESET,
+            '-crf', str(config.ENCODER_CRF),
+            '-threads', str(config.ENCODER_THREADS),
+            # yuv420p + faststart for browser playback
+            '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            self.output_path,
+        ]
+
+        self.process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+        self._failed = False
+
+    def isOpened(self):
+        return self.process.poll() is None
+
+    def write(self, frame):
+        """Send one frame to the encoder (blocks only while the pipe is full)"""
+        try:
+            self.process.stdin.write(frame.tobytes())
+        except BrokenPipeError:
+            self._failed = True
+            err = self.process.stderr.read().decode(errors='replace')
+            raise RuntimeError(f"ffmpeg encoder exited: {err.strip()}")
+
+    def release(self):
+        """Close the pipe and wait for ffmpeg to finish the file; raises if encoding failed"""
+        if self.process.stdin and not self.process.stdin.closed:
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError:
+                pass
+        self.process.wait()
+        # A failed write has already raised with ffmpeg's error output
+        if self.process.returncode != 0 and not self._failed:
+            err = self.process.stderr.read().decode(errors='replace')
+            raise RuntimeError(f"ffmpeg exited with code {self.process.returncode}: {err.strip()}")
+
+def ffmpeg_available():
+    """Check whether the configured ffmpeg binary can be found"""
+    return shutil.which(config.FFMPEG_BINARY) is not None
+
+def create_writer(output_path, fps, frame_size, audio_source=None):
+    """
+    Create a video writer for the processed output.
+    Uses ffmpeg when enabled and installed, otherwise falls back to cv2.VideoWriter.
+    Raises RuntimeError if no writer can be opened, so a job never completes without output.
+    """
+    if not fps or fps <= 0:
+        # Some containers report no frame rate; both writers need a positive one
+        logger.warning(f"Invalid source frame rate {fps}, writing at {config.TARGET_FPS} FPS")
+        fps = config.TARGET_FPS
+    if config.USE_FFMPEG_ENCODER and ffmpeg_available():
+        logger.info(f"Encoding with ffmpeg ({config.ENCODER_CODEC}, preset={config.ENCODER_PRESET}, crf={config.ENCODER_CRF})")
+        return FFmpegWriter(output_path, fps, frame_size, audio_source)
+
+    if config.USE_FFMPEG_ENCODER:
+        logger.warning("ffmpeg not found, falling back to OpenCV VideoWriter")
+
+    # Prefer avc1 (H.264) for browser playback; many OpenCV builds can only write mp4v
+    for code in dict.fromkeys((config.OPENCV_FOURCC, config.OPENCV_FALLBACK_FOURCC)):
+        writer = cv2.VideoWriter(str(output_path), cv2.VideoWriter_fourcc(*code), fps, frame_size)
+        if writer.isOpened():
+            logger.info(f"Encoding with OpenCV VideoWriter ({code})")
+            return writer
+        writer.release()
+        logger.warning(f"OpenCV VideoWriter could not open fourcc '{code}'")
+    raise RuntimeError(f"Could not open a video writer for {output_path}")
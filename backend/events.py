@@ -0,0 +1,128 @@
+import json
+import bisect
+from . import config
+
+EVENT_TYPES = ('lane_departure', 'sharp_curve', 'object')
+
+class EventIndex:
+    def __init__(self, events=None):
+        """
+        Time-indexed list of per-job events, kept sorted by start time.
+        Each event: {'type', 'start', 'end', 'start_frame', 'end_frame', 'data'}
+        """
+        self.events = sorted(events or [], key=lambda e: e['start'])
+        self._starts = [e['start'] for e in self.events]
+        self._max_duration = max((e['end'] - e['start'] for e in self.events), default=0.0)
+
+    def add(self, event):
+        # Events usually arrive in order, so this is an append
+        i = bisect.bisect_right(self._starts, event['start'])
+        self.events.insert(i, event)
+        self._starts.insert(i, event['start'])
+        self._max_duration = max(self._max_duration, event['end'] - event['start'])
+
+    def query(self, start=None, end=None, types=None, label=None):
+        """Events overlapping [start, end], optionally filtered by type and object class"""
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+
+        # Nothing starting before start - max_duration can still overlap the range
+        lo = bisect.bisect_left(self._starts, start - self._max_duration)
+        hi = bisect.bisect_right(self._starts, end)
+
+        results = []
+        for event in self.events[lo:hi]:
+            if event['end'] < start:
+                continue
+            if types and event['type'] not in types:
+                continue
+            if label and event['data'].get('class') != label:
+                continue
+            results.append(event)
+        return results
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({'events': self.events}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f)['events'])
+
+class _Interval:
+    """An open event that closes once its condition has been false for merge_gap seconds"""
+    def __init__(self, event_type, t, frame, data):
+        self.event = {'type': event_type, 'start': t, 'end': t,
+                      'start_frame': frame, 'end_frame': frame, 'data': data}
+
+    def extend(self, t, frame):
+        self.event['end'] = t
+        self.event['end_frame'] = frame
+
+class EventBuilder:
+    def __init__(self, index=None, merge_gap=None):
+        """Turns per-frame metrics and detections into events on an EventIndex"""
+        self.index = index or EventIndex()
+        self.merge_gap = config.EVENT_MERGE_GAP_SECONDS if merge_gap is None else merge_gap
+        self._departure = None
+        self._curve = None
+        self._objects = {}  # class -> event, closed at the end of the video
+
+    def _close_stale(self, t):
+        if self._departure and t - self._departure.event['end'] > self.merge_gap:
+            self.index.add(self._departure.event)
+            self._departure = None
+        if self._curve and t - self._curve.event['end'] > self.merge_gap:
+            self.index.add(self._curve.event)
+            self._curve = None
+
+    def update(self, t, frame, metrics, detections, analysed=True):
+        """
+        t: timestamp in seconds, frame: frame index
+        metrics: calculate_metrics() output or None when no lanes were found
+        detections: TrafficSignDetector.detect() output
+        analysed: False when metrics and detections were carried over from an earlier
+                  frame (skipped or static); intervals extend but detections are not counted
+        """
+        self._close_stale(t)
+
+        if metrics is not None:
+            offset = float(metrics['offset'])
+            if abs(offset) > config.LANE_OFFSET_THRESHOLD:
+                if self._departure is None:
+                    # Positive offset means the vehicle sits right of the lane center
+                    side = 'right' if offset > 0 else 'left'
+                    self._departure = _Interval('lane_departure', t, frame, {'side': side, 'peak_offset': offset})
+                else:
+                    self._departure.extend(t, frame)
+                    if abs(offset) > abs(self._departure.event['data']['peak_offset']):
+                        self._departure.event['data']['peak_offset'] = offset
+
+            curvature = float(metrics['curvature'])
+            if curvature < config.CURVATURE_ALERT_THRESHOLD:
+                if self._curve is None:
+                    self._curve = _Interval('sharp_curve', t, frame, {'min_curvature': curvature})
+                else:
+                    self._curve.extend(t, frame)
+                    data = self._curve.event['data']
+                    data['min_curvature'] = min(data['min_curvature'], curvature)
+
+        for det in detections:
+            label = det['class']
+            obj = self._objects.get(label)
+            if obj is None:
+                self._objects[label] = _Interval('object', t, frame, {'class': label, 'detections': 1})
+            else:
+                obj.extend(t, frame)
+                if analysed:
+                    obj.event['data']['detections'] += 1
+
+    def finalize(self):
+        """Close open intervals and return the index"""
+        for interval in (self._departure, self._curve, *self._objects.values()):
+            if interval is not None:
+                self.index.add(interval.event)
+        self._departure = self._curve = None
+        self._objects = {}
+        return self.index
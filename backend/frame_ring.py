@@ -0,0 +1,144 @@
+import logging
+import multiprocessing as mp
+from collections import deque
+from multiprocessing import shared_memory
+import numpy as np
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Per-worker state, set up once by _init_worker
+_shm = None
+_ring = None
+_traffic_detector = None
+_lane_detector = None
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+_profile = None
+
+def _init_worker(shm_name, ring_shape, model_path, profile):
+    global _shm, _ring, _traffic_detector, _lane_detector, _profile
+    from .traffic_sign_detector import TrafficSignDetector
+    from .lane_detector import LaneDetector
+
+    _shm = _attach(shm_name)
+    _ring = np.ndarray(ring_shape, dtype=np.uint8, buffer=_shm.buf)
+    _traffic_detector = TrafficSignDetector(model_path)
+    _lane_detector = LaneDetector(profile)
+    _profile = profile
+
+def _analyze_slot(slot):
+    """Run the frame-independent analysis on one ring slot, reading it in place"""
+    frame = _ring[slot]
+    sign_results = _traffic_detector.detect(frame, _profile)
+    lane_results = _lane_detector.detect_lanes(frame)
+    # The binary mask is frame-sized; only the fits are needed downstream
+    lane_results.pop('binary_warped', None)
+    return sign_results, lane_results
+
+class FrameRing:
+    def __init__(self, frame_shape, profile, workers=None, slots=None, model_path=None, max_pending=None):
+        """
+        Shared-memory ring of decoded frames analysed by a pool of processes.
+        Frames are written once into a slot; workers read the slot directly,
+        so only the slot index and the compact results cross process boundaries.
+        max_pending caps the frames decoded but not yet handed back, including
+        frames that bypass the workers and so hold no slot.
+        Use as a context manager.
+        """
+        self.frame_shape = tuple(frame_shape)
+        self.profile = profile
+        self.workers = workers or config.ANALYSIS_WORKERS
+        self.slots = slots or self.workers * config.FRAME_RING_SLOTS_PER_WORKER
+        self.model_path = model_path or config.YOLO_MODEL_PATH
+        self.max_pending = max(1, max_pending or config.FRAME_RING_MAX_PENDING or 2 * self.slots)
+        self._shm = None
+        self._pool = None
+        self.ring = None
+
+    def __enter__(self):
+        ring_shape = (self.slots,) + self.frame_shape
+        self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(ring_shape)))
+        self.ring = np.ndarray(ring_shape, dtype=np.uint8, buffer=self._shm.buf)
+        try:
+            self._pool = mp.get_context(config.ANALYSIS_START_METHOD).Pool(
+                self.workers, initializer=_init_worker,
+                initargs=(self._shm.name, ring_shape, self.model_path, self.profile)
+            )
+        except BaseException:
+            # __exit__ will not run, so release the segment here or it stays in /dev/shm
+            self.ring = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            raise
+        logger.info(f"Frame ring: {self.slots} slots x {self.frame_shape}, {self.workers} analysis workers")
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._pool.terminate()
+        self._pool.join()
+        # Drop our view before closing, the buffer cannot be released while exported
+        self.ring = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # A traceback still references a frame view; the mapping goes when it is collected
+            pass
+        self._shm.unlink()
+        return False
+
+    def run(self, read_frame, handle_result, should_analyze=None):
+        """
+        Decode, analyse and hand back every frame in decode order.
+        read_frame() returns the next BGR frame or None at the end of the video.
+        handle_result(frame_index, frame, sign_results, lane_results) gets a view into
+        the ring that is only valid during the call.
+        should_analyze(frame_index, frame), if given, lets frames bypass the workers;
+        they are handed back in order with None results.
+        Returns the number of frames processed.
+        """
+        free = deque(range(self.slots))
+        in_flight = {}
+        next_read = 0
+        next_emit = 0
+        eof = False
+
+        while True:
+            # Keep every free slot busy so the workers never wait on the decoder, but stop
+            # reading ahead once max_pending frames (e.g. a run of static frames) are queued
+            while not eof and free and len(in_flight) < self.max_pending:
+                frame = read_frame()
+                if frame is None:
+                    eof = True
+                    break
+                if should_analyze is not None and not should_analyze(next_read, frame):
+                    in_flight[next_read] = (None, frame)
+                    next_read += 1
+                    continue
+                if frame.shape != self.frame_shape:
+                    raise ValueError(f"Frame shape changed mid-video: {frame.shape} != {self.frame_shape}")
+                slot = free.popleft()
+                np.copyto(self.ring[slot], frame)
+                in_flight[next_read] = (slot, self._pool.apply_async(_analyze_slot, (slot,)))
+                next_read += 1
+
+            if next_emit not in in_flight:
+                return next_emit
+
+            slot, result = in_flight.pop(next_emit)
+            if slot is None:
+                # Not analysed, result is the frame itself
+                handle_result(next_emit, result, None, None)
+                next_emit += 1
+                continue
+            sign_results, lane_results = result.get()
+            handle_result(next_emit, self.ring[slot], sign_results, lane_results)
+            # The consumer is done with the frame, so the slot can be refilled
+            free.append(slot)
+            next_emit += 1
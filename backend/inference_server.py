@@ -0,0 +1,140 @@
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future
+from . import config
+
+logger = logging.getLogger(__name__)
+
+class _Session:
+    """Handle for one caller; batches only wait on callers that submitted recently"""
+    def __init__(self, server):
+        self.server = server
+        self.last_active = time.monotonic()
+
+    def submit(self, frame, profile=None):
+        self.last_active = time.monotonic()
+        return self.server.submit(frame, profile)
+
+    def detect(self, frame, profile=None):
+        return self.submit(frame, profile).result()
+
+class InferenceServer:
+    def __init__(self, detector=None, max_batch_size=None, max_wait_ms=None, client_idle_ms=None):
+        """
+        Single shared YOLO model serving every job in the process.
+        Frames submitted from any thread are grouped into dynamic batches of up to
+        max_batch_size, waiting at most max_wait_ms after the first frame arrives.
+        """
+        if detector is None:
+            from .traffic_sign_detector import TrafficSignDetector
+            detector = TrafficSignDetector(config.YOLO_MODEL_PATH)
+        self.detector = detector
+        self.max_batch_size = max_batch_size or config.INFERENCE_MAX_BATCH_SIZE
+        self.max_wait = (config.INFERENCE_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+        self.client_idle = (config.INFERENCE_CLIENT_IDLE_MS if client_idle_ms is None else client_idle_ms) / 1000.0
+        self.stats = {'batches': 0, 'frames': 0}
+        self._sessions = set()
+        self._clients_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    @contextmanager
+    def session(self):
+        """
+        Register a caller (job or stream) for the duration of the block and yield
+        a handle to submit its frames through.
+        Batches stop waiting once every active caller has a frame in them, so a lone
+        job never pays the max_wait latency. Callers that have not submitted within
+        client_idle (paused or preempted jobs) no longer count as active.
+        """
+        session = _Session(self)
+        with self._clients_lock:
+            self._sessions.add(session)
+        try:
+            yield session
+        finally:
+            with self._clients_lock:
+                self._sessions.discard(session)
+
+    def submit(self, frame, profile=None):
+        """Queue a frame; the returned Future resolves to its detection list"""
+        future = Future()
+        self._queue.put((frame, profile, future))
+        return future
+
+    def detect(self, frame, profile=None):
+        """Blocking drop-in for TrafficSignDetector.detect"""
+        return self.submit(frame, profile).result()
+
+    def annotate_frame(self, frame, results):
+        return self.detector.annotate_frame(frame, results)
+
+    def _active_clients(self):
+        now = time.monotonic()
+        with self._clients_lock:
+            return sum(1 for s in self._sessions if now - s.last_active < self.client_idle)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        clients = self._active_clients()
+        while len(batch) < self.max_batch_size:
+            try:
+                # Anything already queued joins the batch for free
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                # Only wait while some active caller has no frame in this batch yet
+                remaining = deadline - time.monotonic()
+                if len(batch) >= clients or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                # Finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = self._collect(item)
+            frames = [frame for frame, _, _ in batch]
+            # Jobs in one batch may use different profiles (confidence thresholds)
+            profiles = [profile for _, profile, _ in batch]
+            try:
+                results = self.detector.detect_batch(frames, profiles)
+            except Exception as e:
+                logger.error(f"Batched inference failed: {e}")
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, _, future), detections in zip(batch, results):
+                future.set_result(detections)
+            self.stats['batches'] += 1
+            self.stats['frames'] += len(batch)
+
+_server = None
+_server_lock = threading.Lock()
+
+def get_inference_server():
+    """Process-wide InferenceServer, created on first use"""
+    global _server
+    with _server_lock:
+        if _server is None:
+            logger.info("Starting inference server...")
+            _server = InferenceServer()
+        return _server
@@ -0,0 +1,211 @@
+import heapq
+import itertools
+import logging
+import threading
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Lower rank runs first
+PRIORITY_LEVELS = {
+    'high': 0,
+    'normal': 1,
+    'low': 2
+}
+
+class JobCancelled(Exception):
+    """Raised inside the frame loop when a job has been cancelled"""
+    pass
+
+class JobControl:
+    def __init__(self):
+        """Cancel/pause flags shared between the API and a running frame loop"""
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._runnable = threading.Event()
+        self._runnable.set()
+        self.user_paused = False
+        self.preempted = False
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._runnable.is_set()
+
+    def _update(self):
+        if self.user_paused or self.preempted:
+            self._runnable.clear()
+        else:
+            self._runnable.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        # Wake a paused loop so it can exit
+        self._runnable.set()
+
+    def pause(self):
+        with self._lock:
+            self.user_paused = True
+            self._update()
+
+    def resume(self):
+        with self._lock:
+            self.user_paused = False
+            self._update()
+
+    def set_preempted(self, preempted):
+        with self._lock:
+            self.preempted = preempted
+            self._update()
+
+    def checkpoint(self):
+        """Called once per frame: blocks while paused, raises JobCancelled if cancelled"""
+        if self._cancelled.is_set():
+            raise JobCancelled()
+        self._runnable.wait()
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+class JobScheduler:
+    def __init__(self, max_concurrent=None, preemption=None):
+        """
+        Priority queue of processing jobs, each run on its own thread.
+        At most max_concurrent jobs hold a slot; with preemption enabled, a queued
+        job can pause a lower-priority running job at frame granularity and take its slot.
+        """
+        self.max_concurrent = max_concurrent or config.MAX_CONCURRENT_JOBS
+        self.preemption = config.JOB_PREEMPTION if preemption is None else preemption
+        self._lock = threading.Lock()
+        self._queue = []  # (rank, seq, job_id)
+        self._seq = itertools.count()
+        self._tasks = {}  # job_id -> callable(control)
+        self._ranks = {}
+        self._controls = {}
+        self._active = set()     # running and holding a slot
+        self._preempted = set()  # running but paused to free a slot
+        self._suspended = set()  # paused by the user
+
+    def submit(self, job_id, fn, priority='normal'):
+        """Queue fn(control) to run as job_id"""
+        rank = PRIORITY_LEVELS[priority]
+        with self._lock:
+            self._tasks[job_id] = fn
+            self._ranks[job_id] = rank
+            self._controls[job_id] = JobControl()
+            heapq.heappush(self._queue, (rank, next(self._seq), job_id))
+            self._dispatch()
+
+    def get_control(self, job_id):
+        return self._controls.get(job_id)
+
+    def is_queued(self, job_id):
+        with self._lock:
+            return job_id in self._tasks
+
+    def cancel(self, job_id):
+        """
+        Cancel a queued or running job.
+        Returns 'queued' if the job was removed before it started, 'running' if its
+        frame loop will stop at the next checkpoint, or None if it is unknown or finished.
+        """
+        with self._lock:
+            control = self._controls.get(job_id)
+            if control is None:
+                return None
+            control.cancel()
+            if job_id in self._tasks:
+                # Never started: drop it (the heap entry is skipped lazily)
+                del self._tasks[job_id]
+                self._forget(job_id)
+                return 'queued'
+            return 'running'
+
+    def pause(self, job_id):
+        """Pause a running job at the next frame and give its slot to the queue"""
+        with self._lock:
+            control = self._controls.get(job_id)
+            if control is None or job_id in self._tasks:
+                return False
+            control.pause()
+            if job_id in self._active or job_id in self._preempted:
+                self._active.discard(job_id)
+                self._preempted.discard(job_id)
+                self._suspended.add(job_id)
+                self._dispatch()
+            return True
+
+    def resume(self, job_id):
+        """Resume a paused job once a slot is free"""
+        with self._lock:
+            control = self._controls.get(job_id)
+            if control is None or job_id not in self._suspended:
+                return False
+            self._suspended.discard(job_id)
+            # Wait for a slot like a preempted job would
+            control.set_preempted(True)
+            control.resume()
+            self._preempted.add(job_id)
+            self._dispatch()
+            return True
+
+    def _forget(self, job_id):
+        self._controls.pop(job_id, None)
+        self._ranks.pop(job_id, None)
+
+    def _next_queued(self):
+        """Peek the best queued job, discarding cancelled heap entries"""
+        while self._queue and self._queue[0][2] not in self._tasks:
+            heapq.heappop(self._queue)
+        return self._queue[0] if self._queue else None
+
+    def _dispatch(self):
+        # Caller holds self._lock
+        while True:
+            head = self._next_queued()
+            best_preempted = min(self._preempted, key=lambda j: self._ranks[j], default=None)
+
+            if len(self._active) < self.max_concurrent:
+                # A preempted job gets its slot back before an equal or lower priority queued job
+                if best_preempted is not None and (head is None or self._ranks[best_preempted] <= head[0]):
+                    self._preempted.discard(best_preempted)
+                    self._active.add(best_preempted)
+                    self._controls[best_preempted].set_preempted(False)
+                    logger.info(f"Resuming preempted job {best_preempted}")
+                    continue
+                if head is None:
+                    return
+                self._start(heapq.heappop(self._queue)[2])
+                continue
+
+            if head is None or not self.preemption:
+                return
+
+            # All slots busy: preempt the lowest-priority active job if the head outranks it
+            victim = max(self._active, key=lambda j: self._ranks[j])
+            if self._ranks[victim] <= head[0]:
+                return
+            self._active.discard(victim)
+            self._preempted.add(victim)
+            self._controls[victim].set_preempted(True)
+            logger.info(f"Preempting job {victim} for higher-priority job {head[2]}")
+
+    def _start(self, job_id):
+        fn = self._tasks.pop(job_id)
+        control = self._controls[job_id]
+        self._active.add(job_id)
+        thread = threading.Thread(target=self._run, args=(job_id, fn, control), daemon=True)
+        thread.start()
+
+    def _run(self, job_id, fn, control):
+        try:
+            fn(control)
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+                self._preempted.discard(job_id)
+                self._suspended.discard(job_id)
+                self._forget(job_id)
+                self._dispatch()
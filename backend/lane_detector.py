@@ -1,10 +1,11 @@
 import cv2
 import numpy as np
-from . import config
+from .profiles import ProcessingProfile
 
 class LaneDetector:
-    def __init__(self):
+    def __init__(self, profile=None):
         """Initialize lane detection pipeline"""
+        self.profile = profile or ProcessingProfile.from_config()
         self.M = None
         self.Minv = None
         self.left_fit = None
@@ -33,6 +34,11 @@ class LaneDetector:
         Minv = cv2.getPerspectiveTransform(dst, src)
         return M, Minv
     
+    def ensure_transform(self, width, height):
+        """Calculate the perspective transform if not already done"""
+        if self.M is None:
+            self.M, self.Minv = self._get_perspective_transform(width, height)
+    
     def _color_threshold(self, img):
         """Apply color thresholds for white and yellow lane lines"""
         hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
@@ -59,7 +65,7 @@ class LaneDetector:
         leftx_base = np.argmax(histogram[:midpoint])
         rightx_base = np.argmax(histogram[midpoint:]) + midpoint
         
-        window_height = int(binary_warped.shape[0]//config.NWINDOWS)
+        window_height = int(binary_warped.shape[0]//self.profile.nwindows)
         nonzero = binary_warped.nonzero()
         nonzeroy = np.array(nonzero[0])
         nonzerox = np.array(nonzero[1])
@@ -70,14 +76,14 @@ class LaneDetector:
         left_lane_inds = []
         right_lane_inds = []
         
-        for window in range(config.NWINDOWS):
+        for window in range(self.profile.nwindows):
             win_y_low = binary_warped.shape[0] - (window+1)*window_height
             win_y_high = binary_warped.shape[0] - window*window_height
             
-            win_xleft_low = leftx_current - config.MARGIN
-            win_xleft_high = leftx_current + config.MARGIN
-            win_xright_low = rightx_current - config.MARGIN  
-            win_xright_high = rightx_current + config.MARGIN
+            win_xleft_low = leftx_current - self.profile.margin
+            win_xleft_high = leftx_current + self.profile.margin
+            win_xright_low = rightx_current - self.profile.margin  
+            win_xright_high = rightx_current + self.profile.margin
             
             good_left_inds = ((nonzeroy >= win_y_low) & (nonzeroy < win_y_high) &
                               (nonzerox >= win_xleft_low) & (nonzerox < win_xleft_high)).nonzero()[0]
@@ -87,9 +93,9 @@ class LaneDetector:
             left_lane_inds.append(good_left_inds)
             right_lane_inds.append(good_right_inds)
             
-            if len(good_left_inds) > config.MINPIX:
+            if len(good_left_inds) > self.profile.minpix:
                 leftx_current = int(np.mean(nonzerox[good_left_inds]))
-            if len(good_right_inds) > config.MINPIX:
+            if len(good_right_inds) > self.profile.minpix:
                 rightx_current = int(np.mean(nonzerox[good_right_inds]))
         
         left_lane_inds = np.concatenate(left_lane_inds)
@@ -104,7 +110,7 @@ class LaneDetector:
     
     def _fit_polynomial(self, leftx, lefty, rightx, righty):
         """Fit second order polynomial to lane points"""
-        if len(leftx) < config.MIN_LANE_POINTS or len(rightx) < config.MIN_LANE_POINTS:
+        if len(leftx) < self.profile.min_lane_points or len(rightx) < self.profile.min_lane_points:
             return None, None
             
         left_fit = np.polyfit(lefty, leftx, 2)
@@ -115,10 +121,7 @@ class LaneDetector:
     def detect_lanes(self, frame):
         """Main lane detection pipeline"""
         height, width = frame.shape[:2]
-        
-        # Calculate transform if not already done or if size changed
-        if self.M is None:
-             self.M, self.Minv = self._get_perspective_transform(width, height)
+        self.ensure_transform(width, height)
 
         # Apply perspective transform
         warped = cv2.warpPerspective(frame, self.M, 
@@ -157,14 +160,21 @@ class LaneDetector:
         """Draw detected lanes on original image"""
         if left_fit is None or right_fit is None:
             return img
-            
+        
+        newwarp = self.render_lane_layer(img.shape, left_fit, right_fit)
+        
+        # Combine with original image
+        return self.blend_lane_layer(img, newwarp)
+    
+    def render_lane_layer(self, shape, left_fit, right_fit):
+        """Render the lane area and lines, warped back to image space"""
         # Generate x and y values for plotting
-        ploty = np.linspace(0, img.shape[0]-1, img.shape[0])
+        ploty = np.linspace(0, shape[0]-1, shape[0])
         left_fitx = left_fit[0]*ploty**2 + left_fit[1]*ploty + left_fit[2]
         right_fitx = right_fit[0]*ploty**2 + right_fit[1]*ploty + right_fit[2]
         
         # Create image to draw the lines on
-        warp_zero = np.zeros((img.shape[0], img.shape[1], 3), dtype=np.uint8)
+        warp_zero = np.zeros((shape[0], shape[1], 3), dtype=np.uint8)
         
         # Recast x and y points into usable format for cv2.fillPoly()
         pts_left = np.array([np.transpose(np.vstack([left_fitx, ploty]))])
@@ -181,8 +191,8 @@ class LaneDetector:
         cv2.polylines(warp_zero, np.int_([pts_right]), False, (255, 0, 0), thickness=8)
         
         # Warp back to original image space
-        newwarp = cv2.warpPerspective(warp_zero, self.Minv, (img.shape[1], img.shape[0]))
-        
-        # Combine with original image
-        result = cv2.addWeighted(img, 1, newwarp, 0.3, 0)
-        return result
\ No newline at end of file
+        return cv2.warpPerspective(warp_zero, self.Minv, (shape[1], shape[0]))
+    
+    def blend_lane_layer(self, img, layer):
+        """Overlay a rendered lane layer on an image"""
+        return cv2.addWeighted(img, 1, layer, 0.3, 0)
@@ -1,9 +1,11 @@
 import numpy as np
-from . import config
+from .profiles import ProcessingProfile
 
 class LanePredictor:
-    def __init__(self):
+    def __init__(self, profile=None):
         """Initialize Kalman filter for lane tracking and prediction"""
+        profile = profile or ProcessingProfile.from_config()
+        
         # State: [left_a, left_b, left_c, right_a, right_b, right_c, 
         #         left_a_dot, left_b_dot, left_c_dot, right_a_dot, right_b_dot, right_c_dot]
         self.n_states = 12
@@ -11,20 +13,20 @@ class LanePredictor:
         
         # State transition matrix (constant velocity model)
         self.F = np.eye(self.n_states)
-        self.F[0:6, 6:12] = np.eye(6) * config.DT  # Position = position + velocity * dt
+        self.F[0:6, 6:12] = np.eye(6) * profile.dt  # Position = position + velocity * dt
         
         # Measurement matrix (we observe polynomial coefficients directly)
         self.H = np.zeros((self.n_measurements, self.n_states))
         self.H[0:6, 0:6] = np.eye(6)
         
         # Process noise covariance
-        self.Q = np.eye(self.n_states) * config.PROCESS_NOISE
+        self.Q = np.eye(self.n_states) * profile.process_noise
         
         # Measurement noise covariance  
-        self.R = np.eye(self.n_measurements) * config.MEASUREMENT_NOISE
+        self.R = np.eye(self.n_measurements) * profile.measurement_noise
         
         # Initial state covariance
-        self.P = np.eye(self.n_states) * config.INITIAL_UNCERTAINTY
+        self.P = np.eye(self.n_states) * profile.initial_uncertainty
         
         # Initial state
         self.x = np.zeros(self.n_states)
@@ -1,13 +1,19 @@
-from fastapi import FastAPI, UploadFile, File, BackgroundTasks, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Query, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
+import json
 import shutil
 import os
+import time
 import uuid
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 from .processor import VideoProcessor
+from .jobs import JobScheduler, JobCancelled, PRIORITY_LEVELS
+from .storage import StorageManager
+from .events import EventIndex, EVENT_TYPES
+from .profiles import get_profile
 from . import config
 
 app = FastAPI(title="Road Vision Enterprise")
@@ -29,25 +35,53 @@ app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 # Job Store (In-memory for simplicity, use Redis/DB for real enterprise)
 jobs: Dict[str, Dict] = {}
 
+# Loaded event indexes, so range queries never re-read the file
+event_indexes: Dict[str, EventIndex] = {}
+
 # Ensure directories exist
-os.makedirs(config.DATA_DIR / "uploads", exist_ok=True)
+os.makedirs(config.UPLOAD_DIR, exist_ok=True)
 os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+os.makedirs(config.PREVIEW_DIR, exist_ok=True)
+os.makedirs(config.EVENTS_DIR, exist_ok=True)
 
 processor = VideoProcessor()
+scheduler = JobScheduler()
+# Expired results take their cached event index with them
+storage = StorageManager(jobs, on_expire=lambda job_id: event_indexes.pop(job_id, None))
+
+@app.on_event("startup")
+async def start_storage_sweeper():
+    storage.start()
+
+@app.on_event("shutdown")
+async def stop_storage_sweeper():
+    storage.stop()
 
-def process_video_task(job_id: str, input_path: str, output_path: str):
+def process_video_task(job_id: str, input_path: str, output_path: str, control=None, profile=None):
     try:
         jobs[job_id]['status'] = 'processing'
         
         def update_progress(progress):
             jobs[job_id]['progress'] = progress
             
-        processor.process_video(input_path, output_path, update_progress)
+        stats = processor.process_video(input_path, output_path, update_progress, control=control,
+                                        preview_dir=config.PREVIEW_DIR / job_id,
+                                        events_path=config.EVENTS_DIR / f"{job_id}.json",
+                                        profile=profile)
+        
+        jobs[job_id]['stats'] = stats
         
         jobs[job_id]['status'] = 'completed'
         jobs[job_id]['progress'] = 1.0
         jobs[job_id]['output_url'] = f"/api/download/{job_id}"
         
+    except JobCancelled:
+        # Remove the partial output so nothing half-written is served
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        shutil.rmtree(config.PREVIEW_DIR / job_id, ignore_errors=True)
+        jobs[job_id]['status'] = 'cancelled'
+        
     except Exception as e:
         with open("job_error.log", "a") as f:
             f.write(f"JOB FAILED: {str(e)}\n")
@@ -57,6 +91,10 @@ def process_video_task(job_id: str, input_path: str, output_path: str):
         print(f"JOB FAILED: {e}", flush=True)
         jobs[job_id]['status'] = 'failed'
         jobs[job_id]['error'] = str(e)
+        
+    finally:
+        # Storage TTL counts from here
+        jobs[job_id]['finished_at'] = time.time()
 
 @app.get("/")
 async def read_index():
@@ -64,41 +102,107 @@ async def read_index():
     return FileResponse(str(index_path))
 
 @app.post("/api/upload")
-async def upload_video(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+async def upload_video(file: UploadFile = File(...),
+                       priority: str = Form(config.DEFAULT_JOB_PRIORITY),
+                       profile: str = Form(config.DEFAULT_PROFILE)):
+    if priority not in PRIORITY_LEVELS:
+        raise HTTPException(status_code=400, detail=f"Invalid priority, expected one of: {', '.join(PRIORITY_LEVELS)}")
+    try:
+        job_profile = get_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     job_id = str(uuid.uuid4())
     
     input_filename = f"{job_id}_{file.filename}"
-    input_path = config.DATA_DIR / "uploads" / input_filename
+    input_path = config.UPLOAD_DIR / input_filename
     output_filename = f"processed_{input_filename}"
     output_path = config.OUTPUT_DIR / output_filename
     
-    # Save uploaded file
-    with open(input_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    # Initialize job
+    # Initialize job before writing, so the storage sweeper treats the upload as active
     jobs[job_id] = {
         'id': job_id,
         'status': 'queued',
         'progress': 0.0,
-        'filename': file.filename
+        'filename': file.filename,
+        'priority': priority,
+        'profile': profile
     }
     
-    # Start background processing
-    background_tasks.add_task(process_video_task, job_id, str(input_path), str(output_path))
+    # Save uploaded file
+    try:
+        with open(input_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+    except Exception:
+        jobs.pop(job_id, None)
+        if os.path.exists(input_path):
+            os.remove(input_path)
+        raise
+    
+    # Queue for background processing (higher priority jobs may preempt running ones)
+    scheduler.submit(
+        job_id,
+        lambda control: process_video_task(job_id, str(input_path), str(output_path), control, job_profile),
+        priority=priority
+    )
     
     return {"job_id": job_id}
 
+@app.get("/api/profiles")
+async def list_profiles():
+    return {
+        "default": config.DEFAULT_PROFILE,
+        "profiles": {name: get_profile(name).to_dict() for name in config.PROCESSING_PROFILES}
+    }
+
 @app.get("/api/jobs/{job_id}")
 async def get_job_status(job_id: str):
     if job_id not in jobs:
         raise HTTPException(status_code=404, detail="Job not found")
-    return jobs[job_id]
+    job = jobs[job_id]
+    control = scheduler.get_control(job_id)
+    if job['status'] == 'processing' and control is not None and control.paused:
+        return {**job, 'status': 'paused', 'preempted': control.preempted and not control.user_paused}
+    return job
+
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    cancelled = scheduler.cancel(job_id)
+    if cancelled is None:
+        raise HTTPException(status_code=409, detail=f"Job is already {jobs[job_id]['status']}")
+    # Decided by the scheduler: a dispatched job may not have set 'processing' yet
+    if cancelled == 'queued':
+        # Never started, so there is no frame loop to report back
+        jobs[job_id]['status'] = 'cancelled'
+        jobs[job_id]['finished_at'] = time.time()
+        return {"job_id": job_id, "status": "cancelled"}
+    # The frame loop stops at its next checkpoint and cleans up
+    return {"job_id": job_id, "status": "cancelling"}
+
+@app.post("/api/jobs/{job_id}/pause")
+async def pause_job(job_id: str):
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not scheduler.pause(job_id):
+        raise HTTPException(status_code=409, detail="Only running jobs can be paused")
+    return {"job_id": job_id, "status": "paused"}
+
+@app.post("/api/jobs/{job_id}/resume")
+async def resume_job(job_id: str):
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not scheduler.resume(job_id):
+        raise HTTPException(status_code=409, detail="Job is not paused")
+    return {"job_id": job_id, "status": "processing"}
 
 @app.get("/api/download/{job_id}")
 async def download_result(job_id: str):
     if job_id not in jobs or jobs[job_id]['status'] != 'completed':
         raise HTTPException(status_code=404, detail="Result not ready")
+    if jobs[job_id].get('expired'):
+        raise HTTPException(status_code=410, detail="Result expired")
         
     # Reconstruct path (in a real app, store this in DB)
     # We need to find the file in the output directory that matches the job ID
@@ -106,5 +210,72 @@ async def download_result(job_id: str):
     input_filename = f"{job_id}_{jobs[job_id]['filename']}"
     output_filename = f"processed_{input_filename}"
     output_path = config.OUTPUT_DIR / output_filename
+    storage.touch(output_path)
     
     return FileResponse(output_path, media_type="video/mp4", filename=f"processed_{jobs[job_id]['filename']}")
+
+def _preview_file(job_id: str, *parts: str):
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    path = config.PREVIEW_DIR / job_id
+    for part in parts:
+        path = path / part
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="Preview not available")
+    return path
+
+@app.get("/api/previews/{job_id}")
+async def get_previews(job_id: str):
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    preview_dir = config.PREVIEW_DIR / job_id
+    index_path = preview_dir / "index.json"
+    if index_path.is_file():
+        with open(index_path) as f:
+            return json.load(f)
+    # Still processing: list the thumbnails written so far
+    thumbs_dir = preview_dir / "thumbnails"
+    thumbnails = sorted(os.listdir(thumbs_dir)) if thumbs_dir.is_dir() else []
+    return {
+        'thumbnails': [{'index': i, 'file': name} for i, name in enumerate(thumbnails)],
+        'poster': 'poster.jpg' if (preview_dir / "poster.jpg").is_file() else None,
+        'sprite': None
+    }
+
+@app.get("/api/previews/{job_id}/poster")
+async def get_poster(job_id: str):
+    return FileResponse(_preview_file(job_id, "poster.jpg"), media_type="image/jpeg")
+
+@app.get("/api/previews/{job_id}/sprite")
+async def get_sprite(job_id: str):
+    return FileResponse(_preview_file(job_id, "sprite.jpg"), media_type="image/jpeg")
+
+@app.get("/api/previews/{job_id}/thumbnails/{index}")
+async def get_thumbnail(job_id: str, index: int):
+    return FileResponse(_preview_file(job_id, "thumbnails", f"{index:05d}.jpg"), media_type="image/jpeg")
+
+@app.get("/api/jobs/{job_id}/events")
+async def query_events(job_id: str,
+                       start: Optional[float] = None,
+                       end: Optional[float] = None,
+                       type: Optional[str] = Query(None, description="Comma-separated event types"),
+                       label: Optional[str] = Query(None, description="Object class for 'object' events")):
+    if job_id not in jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if jobs[job_id]['status'] != 'completed':
+        raise HTTPException(status_code=409, detail="Events are available once the job has completed")
+    if jobs[job_id].get('expired'):
+        raise HTTPException(status_code=410, detail="Result expired")
+    
+    types = type.split(',') if type else None
+    if types and any(t not in EVENT_TYPES for t in types):
+        raise HTTPException(status_code=400, detail=f"Invalid event type, expected: {', '.join(EVENT_TYPES)}")
+    
+    index = event_indexes.get(job_id)
+    if index is None:
+        events_path = config.EVENTS_DIR / f"{job_id}.json"
+        if not events_path.is_file():
+            raise HTTPException(status_code=404, detail="Event index not available")
+        index = event_indexes[job_id] = EventIndex.load(events_path)
+    
+    return {"job_id": job_id, "events": index.query(start, end, types, label)}
@@ -0,0 +1,112 @@
+import os
+import json
+import math
+import cv2
+import numpy as np
+from . import config
+
+class PreviewBuilder:
+    def __init__(self, preview_dir, fps, total_frames, frame_size):
+        """
+        Builds thumbnails, a sprite sheet and a poster frame from frames
+        the processor already has in memory (no second decode).
+        """
+        self.preview_dir = str(preview_dir)
+        os.makedirs(os.path.join(self.preview_dir, "thumbnails"), exist_ok=True)
+        self.fps = fps if fps and fps > 0 else config.TARGET_FPS
+
+        # Widen the interval on long videos so the sprite sheet stays bounded;
+        # when the length is unknown, add() widens it as thumbnails accumulate
+        interval = max(1, int(round(self.fps * config.PREVIEW_INTERVAL_SECONDS)))
+        if total_frames > 0:
+            interval = max(interval, math.ceil(total_frames / config.PREVIEW_MAX_THUMBNAILS))
+        self.interval = interval
+
+        width, height = frame_size
+        self.thumb_size = (config.PREVIEW_THUMBNAIL_WIDTH,
+                           max(1, int(round(height * config.PREVIEW_THUMBNAIL_WIDTH / width))))
+        self.poster_size = (config.PREVIEW_POSTER_WIDTH,
+                            max(1, int(round(height * config.PREVIEW_POSTER_WIDTH / width))))
+        self.poster_frame = int(total_frames * config.PREVIEW_POSTER_POSITION) if total_frames > 0 else 0
+
+        self.thumbnails = []
+        self._tiles = []
+        self._poster_written = False
+
+    def add(self, frame, frame_index):
+        """Offer a rendered frame; only frames on the sampling grid are kept"""
+        if not self._poster_written and frame_index >= self.poster_frame:
+            poster = cv2.resize(frame, self.poster_size, interpolation=cv2.INTER_AREA)
+            cv2.imwrite(os.path.join(self.preview_dir, "poster.jpg"), poster,
+                        [cv2.IMWRITE_JPEG_QUALITY, config.PREVIEW_JPEG_QUALITY])
+            self._poster_written = True
+
+        if frame_index % self.interval != 0:
+            return
+        if len(self.thumbnails) >= config.PREVIEW_MAX_THUMBNAILS:
+            self._widen_interval()
+            if frame_index % self.interval != 0:
+                return
+
+        thumb = cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA)
+        n = len(self.thumbnails)
+        filename = f"{n:05d}.jpg"
+        cv2.imwrite(os.path.join(self.preview_dir, "thumbnails", filename), thumb,
+                    [cv2.IMWRITE_JPEG_QUALITY, config.PREVIEW_JPEG_QUALITY])
+        self._tiles.append(thumb)
+        self.thumbnails.append({
+            'index': n,
+            'frame': frame_index,
+            'time': round(frame_index / self.fps, 3),
+            'file': filename
+        })
+
+    def _widen_interval(self):
+        """Double the interval and keep every other thumbnail, renumbering the files"""
+        self.interval *= 2
+        thumbs_dir = os.path.join(self.preview_dir, "thumbnails")
+        kept, tiles = [], []
+        for thumb, tile in zip(self.thumbnails, self._tiles):
+            path = os.path.join(thumbs_dir, thumb['file'])
+            if thumb['frame'] % self.interval != 0:
+                os.remove(path)
+                continue
+            # New index never exceeds the old one, and lower files were already moved or removed
+            n = len(kept)
+            filename = f"{n:05d}.jpg"
+            if filename != thumb['file']:
+                os.replace(path, os.path.join(thumbs_dir, filename))
+            kept.append({**thumb, 'index': n, 'file': filename})
+            tiles.append(tile)
+        self.thumbnails, self._tiles = kept, tiles
+
+    def finalize(self):
+        """Write the sprite sheet and index.json; returns the manifest"""
+        columns = config.PREVIEW_SPRITE_COLUMNS
+        tw, th = self.thumb_size
+        manifest = {
+            'interval_frames': self.interval,
+            'interval_seconds': round(self.interval / self.fps, 3),
+            'thumbnail_size': [tw, th],
+            'thumbnails': self.thumbnails,
+            'poster': 'poster.jpg' if self._poster_written else None,
+            'sprite': None
+        }
+
+        if self._tiles:
+            rows = math.ceil(len(self._tiles) / columns)
+            sprite = np.zeros((rows * th, columns * tw, 3), dtype=np.uint8)
+            for i, tile in enumerate(self._tiles):
+                r, c = divmod(i, columns)
+                sprite[r*th:(r+1)*th, c*tw:(c+1)*tw] = tile
+            cv2.imwrite(os.path.join(self.preview_dir, "sprite.jpg"), sprite,
+                        [cv2.IMWRITE_JPEG_QUALITY, config.PREVIEW_JPEG_QUALITY])
+            manifest['sprite'] = 'sprite.jpg'
+            manifest['sprite_columns'] = columns
+            manifest['sprite_rows'] = rows
+            # Free the tiles, they are on disk now
+            self._tiles = []
+
+        with open(os.path.join(self.preview_dir, "index.json"), "w") as f:
+            json.dump(manifest, f)
+        return manifest
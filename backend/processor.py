@@ -1,11 +1,21 @@
 import cv2
 import time
 import logging
+from collections import deque
+from contextlib import nullcontext
 from pathlib import Path
 from .traffic_sign_detector import TrafficSignDetector
 from .lane_detector import LaneDetector
 from .lane_predictor import LanePredictor
-from .utils import draw_overlay, calculate_metrics
+from .utils import draw_overlay, calculate_metrics, scaled_size, scale_detections, scale_lane_fit
+from .encoder import create_writer
+from .previews import PreviewBuilder
+from .events import EventBuilder
+from .frame_ring import FrameRing
+from .inference_server import InferenceServer, get_inference_server
+from .profiles import ProcessingProfile
+from .scene_change import StaticSceneDetector
+from .jobs import JobCancelled
 from . import config
 
 # Configure logging
@@ -13,8 +23,9 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class VideoProcessor:
-    def __init__(self):
-        self.traffic_detector = None
+    def __init__(self, traffic_detector=None):
+        """traffic_detector: optional detector or InferenceServer to use instead of the configured one"""
+        self.traffic_detector = traffic_detector
         self.lane_detector = None
         self.lane_predictor = None
         self.is_initialized = False
@@ -22,18 +33,40 @@ class VideoProcessor:
     def initialize(self):
         if not self.is_initialized:
             logger.info("Initializing models...")
-            self.traffic_detector = TrafficSignDetector(config.YOLO_MODEL_PATH)
+            if self.traffic_detector is None:
+                if config.USE_INFERENCE_SERVER:
+                    # One shared model, batched across all concurrent jobs
+                    self.traffic_detector = get_inference_server()
+                else:
+                    self.traffic_detector = TrafficSignDetector(config.YOLO_MODEL_PATH)
             self.lane_detector = LaneDetector()
             self.lane_predictor = LanePredictor()
             self.is_initialized = True
             logger.info("Models initialized.")
 
-    def process_video(self, input_path: str, output_path: str, progress_callback=None):
+    def process_video(self, input_path: str, output_path: str, progress_callback=None, control=None, preview_dir=None, events_path=None, parallel=None, frame_callback=None, profile=None):
         """
         Process a video file and save the result.
         progress_callback: function(progress_float)
+        control: optional JobControl, checked every frame for cancel/pause
+        preview_dir: optional directory for thumbnails, sprite sheet and poster
+        events_path: optional JSON path for the job's event index
+        parallel: analyse frames in a process pool over a shared-memory ring
+                  (defaults to config.PARALLEL_ANALYSIS)
+        frame_callback: optional function(frame_index, record) receiving per-frame
+                        detections and lane fits in source-frame coordinates
+        profile: ProcessingProfile for this job (defaults to the settings in config)
+        Returns a dict of processing stats (frames, elapsed seconds, fps, and how many
+        frames skipped analysis or reused it on a static scene).
         """
         self.initialize()
+        if parallel is None:
+            parallel = config.PARALLEL_ANALYSIS
+        profile = profile or ProcessingProfile.from_config()
+        
+        # Lane geometry and Kalman state are per-video (and per-thread when jobs overlap)
+        lane_detector = LaneDetector(profile)
+        lane_predictor = LanePredictor(profile)
         
         cap = cv2.VideoCapture(input_path)
         if not cap.isOpened():
@@ -45,66 +78,188 @@ class VideoProcessor:
         fps = cap.get(cv2.CAP_PROP_FPS)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         
-        # Setup writer
-        # Use avc1 (H.264) for better browser compatibility
-        fourcc = cv2.VideoWriter_fourcc(*'avc1')
-        writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-        
-        frame_count = 0
-        alerts = []
+        # Proxy mode: analyse a reduced copy, draw overlays only at the output resolution
+        analysis_size = scaled_size(width, height, profile.proxy_width)
+        output_size = scaled_size(width, height, profile.output_width)
+        analysis_w, analysis_h = analysis_size
+        output_w, output_h = output_size
+        sx, sy = output_w / analysis_w, output_h / analysis_h
+        src_sx, src_sy = width / analysis_w, height / analysis_h
         
-        logger.info(f"Starting processing: {input_path} -> {output_path}")
+        # Drawing needs the perspective transform at the output size
+        render_lanes = LaneDetector(profile)
+        render_lanes.ensure_transform(output_w, output_h)
         
+        # Setup writer (ffmpeg subprocess, or OpenCV fallback)
         try:
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # 1. Traffic Sign Detection
-                sign_results = self.traffic_detector.detect(frame)
-                annotated_frame = self.traffic_detector.annotate_frame(frame, sign_results)
-                
-                # 2. Lane Detection
-                lane_results = self.lane_detector.detect_lanes(frame)
-                
+            writer = create_writer(output_path, fps, output_size, audio_source=input_path)
+        except Exception:
+            cap.release()
+            raise
+        previews = PreviewBuilder(preview_dir, fps, total_frames, output_size) if preview_dir else None
+        
+        # Output-size frames waiting for their analysis results (always emitted in order)
+        pending_output = deque()
+        
+        frames_done = 0
+        events = EventBuilder()
+        start_time = time.time()
+        
+        logger.info(f"Starting processing: {input_path} -> {output_path} "
+                    f"(profile {profile.name}, source {width}x{height}, analysis {analysis_w}x{analysis_h}, output {output_w}x{output_h})")
+        
+        def read_frame():
+            """Decode the next frame, resize it once per target, return the analysis copy"""
+            if control is not None:
+                control.checkpoint()  # Blocks while paused, raises JobCancelled
+            ret, frame = cap.read()
+            if not ret:
+                return None
+            
+            output_frame = frame
+            if output_size != (width, height):
+                output_frame = cv2.resize(frame, output_size, interpolation=cv2.INTER_AREA)
+            
+            if analysis_size == (width, height):
+                analysis_frame = frame
+            elif analysis_size == output_size:
+                analysis_frame = output_frame
+            else:
+                analysis_frame = cv2.resize(frame, analysis_size, interpolation=cv2.INTER_AREA)
+            
+            pending_output.append(output_frame)
+            return analysis_frame
+        
+        # Last analysed results, reused on frames that skip analysis
+        last = {'signs': [], 'lanes': None, 'metrics': None}
+        # Rendered lane layer for the last drawn fits, reused while they are unchanged
+        lane_layer = {'lanes': None, 'layer': None}
+        counts = {'skipped': 0, 'reused': 0}
+        
+        static_scene = None
+        if profile.static_reuse:
+            static_scene = StaticSceneDetector(profile.static_threshold, profile.static_max_reuse)
+        
+        def should_analyze(frame_count, frame):
+            if frame_count % profile.skip_frames != 0:
+                counts['skipped'] += 1
+                return False
+            if static_scene is not None and static_scene.is_static(frame, frame_count):
+                # Stopped vehicle: no part of the frame changed since the last analysis
+                counts['reused'] += 1
+                return False
+            return True
+        
+        def finish_frame(frame_count, frame, sign_results, lane_results):
+            """Sequential part of the pipeline: Kalman smoothing, drawing, events and encode"""
+            # frame is the analysis copy; rendering uses the matching output frame
+            output_frame = pending_output.popleft()
+            analysed = sign_results is not None
+            
+            if not analysed:
+                # Frame was not analysed: carry the previous results forward
+                sign_results = last['signs']
+                predicted_lanes, metrics = last['lanes'], last['metrics']
+            else:
                 # 3. Lane Prediction & Smoothing
-                results = {'signs': sign_results, 'lane_offset': None, 'curvature': None}
-                
+                predicted_lanes, metrics = None, None
                 if lane_results['valid']:
-                    predicted_lanes = self.lane_predictor.update_and_predict(
+                    predicted_lanes = lane_predictor.update_and_predict(
                         lane_results['left_fit'], 
                         lane_results['right_fit']
                     )
-                    
-                    final_frame = self.lane_detector.draw_lanes(
-                        annotated_frame, 
-                        predicted_lanes['left_fit'], 
-                        predicted_lanes['right_fit']
-                    )
-                    
-                    metrics = calculate_metrics(predicted_lanes, (height, width))
-                    results['lane_offset'] = metrics['offset']
-                    results['curvature'] = metrics['curvature']
-                    
-                else:
-                    final_frame = annotated_frame
+                    # Measured in source pixels, so meters do not depend on the proxy width
+                    metrics = calculate_metrics({
+                        'left_fit': scale_lane_fit(predicted_lanes['left_fit'], src_sx, src_sy),
+                        'right_fit': scale_lane_fit(predicted_lanes['right_fit'], src_sx, src_sy)
+                    }, (height, width))
+                elif lane_predictor.initialized:
                     # Use prediction if available (fail-safe)
-                    if self.lane_predictor.initialized:
-                        self.lane_predictor.predict()
-                        # We could draw predicted lanes here even if detection failed
-                
-                # Add overlay
-                results['fps'] = fps # Use source FPS for static video analysis
-                final_frame = draw_overlay(final_frame, results, frame_count)
-                
-                writer.write(final_frame)
-                
-                frame_count += 1
-                if progress_callback and frame_count % 10 == 0:
-                    progress = min(1.0, frame_count / total_frames)
-                    progress_callback(progress)
+                    lane_predictor.predict()
+                    # We could draw predicted lanes here even if detection failed
+                last.update(signs=sign_results, lanes=predicted_lanes, metrics=metrics)
+            
+            annotated_frame = self.traffic_detector.annotate_frame(
+                output_frame, scale_detections(sign_results, sx, sy)
+            )
+            results = {'signs': sign_results, 'lane_offset': None, 'curvature': None}
+            
+            if predicted_lanes is not None:
+                if not (config.STATIC_REUSE_OVERLAY and lane_layer['lanes'] is predicted_lanes):
+                    lane_layer['lanes'] = predicted_lanes
+                    lane_layer['layer'] = render_lanes.render_lane_layer(
+                        annotated_frame.shape,
+                        scale_lane_fit(predicted_lanes['left_fit'], sx, sy), 
+                        scale_lane_fit(predicted_lanes['right_fit'], sx, sy)
+                    )
+                final_frame = render_lanes.blend_lane_layer(annotated_frame, lane_layer['layer'])
+                results['lane_offset'] = metrics['offset']
+                results['curvature'] = metrics['curvature']
+            else:
+                final_frame = annotated_frame
+            
+            if frame_callback is not None:
+                # Source coordinates make runs at different resolutions comparable
+                frame_callback(frame_count, {
+                    'detections': scale_detections(sign_results, src_sx, src_sy),
+                    'left_fit': scale_lane_fit(predicted_lanes['left_fit'], src_sx, src_sy).tolist() if metrics else None,
+                    'right_fit': scale_lane_fit(predicted_lanes['right_fit'], src_sx, src_sy).tolist() if metrics else None,
+                    'offset': float(metrics['offset']) if metrics else None,
+                    'curvature': float(metrics['curvature']) if metrics else None
+                })
+            
+            # 4. Event Index (lane departures, sharp curves, object appearances)
+            events.update(frame_count / fps if fps else 0.0, frame_count, metrics, sign_results, analysed)
+            
+            # Add overlay
+            results['fps'] = fps # Use source FPS for static video analysis
+            final_frame = draw_overlay(final_frame, results, frame_count)
+            
+            writer.write(final_frame)
+            if previews is not None:
+                previews.add(final_frame, frame_count)
+            
+            if progress_callback and total_frames > 0 and (frame_count + 1) % 10 == 0:
+                progress = min(1.0, (frame_count + 1) / total_frames)
+                progress_callback(progress)
+        
+        try:
+            if parallel:
+                # 1 + 2 run in worker processes reading frames from shared memory
+                with FrameRing((analysis_h, analysis_w, 3), profile) as ring:
+                    frames_done = ring.run(read_frame, finish_frame, should_analyze)
+            else:
+                batched = isinstance(self.traffic_detector, InferenceServer)
+                # Registering with the shared server lets batches wait for this job's frames
+                with self.traffic_detector.session() if batched else nullcontext() as client:
+                    while True:
+                        frame = read_frame()
+                        if frame is None:
+                            break
+                        
+                        if not should_analyze(frames_done, frame):
+                            finish_frame(frames_done, frame, None, None)
+                            frames_done += 1
+                            continue
+                        
+                        # 1. Traffic Sign Detection (batched on the server while lanes are found)
+                        if batched:
+                            sign_future = client.submit(frame, profile)
+                        else:
+                            sign_results = self.traffic_detector.detect(frame, profile)
+                        
+                        # 2. Lane Detection
+                        lane_results = lane_detector.detect_lanes(frame)
+                        
+                        if batched:
+                            sign_results = sign_future.result()
+                        
+                        finish_frame(frames_done, frame, sign_results, lane_results)
+                        frames_done += 1
                     
+        except JobCancelled:
+            logger.info(f"Processing cancelled at frame {frames_done}: {input_path}")
+            raise
         except Exception as e:
             logger.error(f"Processing failed: {e}")
             raise e
@@ -112,5 +267,24 @@ class VideoProcessor:
             cap.release()
             writer.release()
             logger.info("Processing complete.")
-            
-        return True
+        
+        if previews is not None:
+            previews.finalize()
+        
+        event_index = events.finalize()
+        if events_path:
+            event_index.save(events_path)
+        
+        elapsed = time.time() - start_time
+        return {
+            'frames': frames_done,
+            'elapsed': elapsed,
+            'fps': frames_done / elapsed if elapsed > 0 else 0.0,
+            'events': len(event_index.events),
+            'skipped_frames': counts['skipped'],
+            'reused_frames': counts['reused'],
+            'profile': profile.name,
+            'source_size': (width, height),
+            'analysis_size': analysis_size,
+            'output_size': output_size
+        }
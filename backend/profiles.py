@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field, fields
+from typing import Optional
+from . import config
+
+def _from_config(key):
+    """Field default read from backend.config when the profile is built, so config stays the only source"""
+    return field(default_factory=lambda: getattr(config, key))
+
+@dataclass(frozen=True)
+class ProcessingProfile:
+    """Per-job tuning, passed into the processor and detectors instead of reading config globals"""
+    name: str = 'config'                 # Unnamed profiles are the current config plus overrides
+
+    # Detection
+    sign_confidence_threshold: float = _from_config('SIGN_CONFIDENCE_THRESHOLD')
+
+    # Lane detection
+    nwindows: int = _from_config('NWINDOWS')
+    margin: int = _from_config('MARGIN')
+    minpix: int = _from_config('MINPIX')
+    min_lane_points: int = _from_config('MIN_LANE_POINTS')
+
+    # Kalman filter
+    dt: float = _from_config('DT')
+    process_noise: float = _from_config('PROCESS_NOISE')
+    measurement_noise: float = _from_config('MEASUREMENT_NOISE')
+    initial_uncertainty: float = _from_config('INITIAL_UNCERTAINTY')
+
+    # Video processing
+    skip_frames: int = _from_config('PROCESSING_SKIP_FRAMES')           # Analyse every Nth frame, reuse results in between
+    proxy_width: Optional[int] = _from_config('PROXY_ANALYSIS_WIDTH')   # None analyses at source resolution
+    output_width: Optional[int] = _from_config('OUTPUT_WIDTH')          # None renders at source resolution
+    
+    # Static-scene reuse
+    static_reuse: bool = _from_config('STATIC_SCENE_REUSE')
+    static_threshold: float = _from_config('STATIC_SCENE_THRESHOLD')
+    static_max_reuse: int = _from_config('STATIC_SCENE_MAX_REUSE')
+
+    def __post_init__(self):
+        if not 0.0 < self.sign_confidence_threshold < 1.0:
+            raise ValueError("sign_confidence_threshold must be between 0 and 1")
+        for name in ('nwindows', 'margin', 'minpix', 'min_lane_points', 'skip_frames', 'static_max_reuse'):
+            value = getattr(self, name)
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"{name} must be a positive integer")
+        for name in ('proxy_width', 'output_width'):
+            value = getattr(self, name)
+            if value is not None and (not isinstance(value, int) or value < 64):
+                raise ValueError(f"{name} must be None or an integer of at least 64")
+        if self.static_threshold < 0:
+            raise ValueError("static_threshold must be non-negative")
+
+    @classmethod
+    def from_config(cls, **overrides):
+        """Profile built from the current module-level settings in backend.config, with fields overridden"""
+        return cls(**overrides)
+
+    def to_dict(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+def get_profile(name):
+    """Look up a named profile from config.PROCESSING_PROFILES; raises ValueError if unknown"""
+    if name not in config.PROCESSING_PROFILES:
+        raise ValueError(f"Unknown profile '{name}', expected one of: {', '.join(config.PROCESSING_PROFILES)}")
+    return ProcessingProfile.from_config(name=name, **config.PROCESSING_PROFILES[name])
@@ -0,0 +1,46 @@
+import cv2
+import numpy as np
+from . import config
+
+class StaticSceneDetector:
+    def __init__(self, threshold, max_reuse, sample_width=None, block_size=None):
+        """
+        Cheap change detector for stopped-vehicle segments.
+        Frames are compared as small grayscale thumbnails against the last analysed
+        frame (not the previous one), so slow drift still triggers a fresh analysis.
+        The score is the largest per-block mean difference, so a pedestrian in one
+        corner is not averaged away by the unchanged rest of the frame.
+        threshold: per-block mean absolute difference (0-255) below which a frame counts as static
+        max_reuse: force a fresh analysis once this many source frames have passed since the last one
+        """
+        self.threshold = threshold
+        self.max_reuse = max_reuse
+        self.sample_width = sample_width or config.STATIC_SCENE_SAMPLE_WIDTH
+        self.block_size = block_size or config.STATIC_SCENE_BLOCK_SIZE
+        self._reference = None
+        self._reference_index = None
+
+    def _signature(self, frame):
+        h, w = frame.shape[:2]
+        size = (self.sample_width, max(1, int(round(h * self.sample_width / w))))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+    def score(self, signature):
+        """Largest mean absolute difference over any block of the thumbnail"""
+        diff = np.abs(signature - self._reference).astype(np.float32)
+        h, w = diff.shape
+        grid = (max(1, -(-w // self.block_size)), max(1, -(-h // self.block_size)))
+        # Area interpolation averages each grid cell, including partial edge blocks
+        return float(cv2.resize(diff, grid, interpolation=cv2.INTER_AREA).max())
+
+    def is_static(self, frame, frame_index):
+        """True if the frame can reuse the last analysis; otherwise it becomes the new reference"""
+        signature = self._signature(frame)
+        if (self._reference is not None and
+                frame_index - self._reference_index <= self.max_reuse and
+                self.score(signature) < self.threshold):
+            return True
+        self._reference = signature
+        self._reference_index = frame_index
+        return False
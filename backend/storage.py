@@ -0,0 +1,149 @@
+import os
+import re
+import time
+import shutil
+import logging
+import threading
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Uploads are stored as "<job_id>_<name>", outputs as "processed_<job_id>_<name>"
+JOB_ID_PATTERN = re.compile(r'^(?:processed_)?([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})_')
+
+ACTIVE_STATUSES = ('queued', 'processing')
+
+def job_id_for(filename):
+    """Extract the job ID from a stored file name, or None for unrelated files"""
+    match = JOB_ID_PATTERN.match(filename)
+    return match.group(1) if match else None
+
+class StorageManager:
+    def __init__(self, jobs, quotas=None, ttl=None, interval=None, on_expire=None):
+        """
+        Keeps data directories within byte quotas.
+        jobs: the job store, used to protect files of queued/processing jobs
+        quotas: {directory: max_bytes}; files past the TTL are removed first, then
+        least-recently-used files until each directory is under its quota.
+        Only files named after a job are ever removed; anything else in the directory
+        still counts toward usage.
+        on_expire: optional function(job_id) called when a job's result is removed,
+        e.g. to drop caches built from it
+        """
+        self.jobs = jobs
+        self.on_expire = on_expire
+        self.quotas = quotas if quotas is not None else config.STORAGE_QUOTAS
+        self.ttl = config.STORAGE_TTL_SECONDS if ttl is None else ttl
+        self.interval = interval or config.STORAGE_SWEEP_INTERVAL
+        self._last_access = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def touch(self, path):
+        """Record a read (e.g. a download) so LRU eviction keeps the file longer"""
+        with self._lock:
+            self._last_access[os.path.abspath(path)] = time.time()
+
+    def _is_protected(self, job_id):
+        if job_id is None:
+            # Not a job file (e.g. a sample video placed by hand): never ours to remove
+            return True
+        job = self.jobs.get(job_id)
+        return job is not None and job['status'] in ACTIVE_STATUSES
+
+    def _expired(self, job_id, entry, now):
+        if self.ttl <= 0:
+            return False
+        job = self.jobs.get(job_id) if job_id else None
+        # Completed jobs age from when they finished; job files from a previous run from their mtime
+        finished_at = job.get('finished_at') if job else None
+        return now - (finished_at or entry['mtime']) > self.ttl
+
+    def _scan(self, directory):
+        entries = []
+        with os.scandir(directory) as it:
+            for item in it:
+                if not item.is_file(follow_symlinks=False):
+                    continue
+                st = item.stat()
+                path = os.path.abspath(item.path)
+                entries.append({
+                    'path': path,
+                    'size': st.st_size,
+                    'mtime': st.st_mtime,
+                    'last_used': max(st.st_mtime, self._last_access.get(path, 0)),
+                    'job_id': job_id_for(item.name)
+                })
+        return entries
+
+    def _remove(self, entry, reason):
+        try:
+            os.remove(entry['path'])
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove {entry['path']}: {e}")
+            return False
+        with self._lock:
+            self._last_access.pop(entry['path'], None)
+        job = self.jobs.get(entry['job_id']) if entry['job_id'] else None
+        if os.path.basename(entry['path']).startswith('processed_') and entry['job_id']:
+            # Previews and events are only useful alongside the processed video
+            shutil.rmtree(os.path.join(config.PREVIEW_DIR, entry['job_id']), ignore_errors=True)
+            events_path = os.path.join(config.EVENTS_DIR, f"{entry['job_id']}.json")
+            if os.path.exists(events_path):
+                os.remove(events_path)
+            if job is not None:
+                job['expired'] = True
+            if self.on_expire is not None:
+                self.on_expire(entry['job_id'])
+        logger.info(f"Removed {entry['path']} ({entry['size']} bytes, {reason})")
+        return True
+
+    def sweep(self):
+        """Run one expiry + eviction pass. Returns the number of bytes freed."""
+        now = time.time()
+        freed = 0
+        for directory, quota in self.quotas.items():
+            if not os.path.isdir(directory):
+                continue
+            entries = [e for e in self._scan(directory) if not self._is_protected(e['job_id'])]
+
+            kept = []
+            for entry in entries:
+                if self._expired(entry['job_id'], entry, now) and self._remove(entry, 'ttl'):
+                    freed += entry['size']
+                else:
+                    kept.append(entry)
+
+            if quota is None:
+                continue
+            # Protected files still count toward usage, they just cannot be evicted
+            usage = sum(e['size'] for e in self._scan(directory))
+            for entry in sorted(kept, key=lambda e: e['last_used']):
+                if usage <= quota:
+                    break
+                if self._remove(entry, 'lru'):
+                    usage -= entry['size']
+                    freed += entry['size']
+            if usage > quota:
+                logger.warning(f"{directory} is over quota ({usage} > {quota} bytes) with only active files left")
+        return freed
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Storage sweep failed: {e}")
+
+    def start(self):
+        """Start the background sweeper thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -9,30 +9,47 @@ class TrafficSignDetector:
         self.model = YOLO(model_path)
         self.class_names = self.model.names
         
-    def detect(self, frame):
+    def detect(self, frame, profile=None):
         """Detect traffic signs in frame"""
-        results = self.model(frame, conf=config.SIGN_CONFIDENCE_THRESHOLD)
+        threshold = self._threshold(profile)
+        results = self.model(frame, conf=threshold)
         
         detections = []
         for r in results:
-            for box in r.boxes:
-                # Confidence and class
-                conf = float(box.conf[0])
-                if conf > config.SIGN_CONFIDENCE_THRESHOLD:
-                    # xyxy comes as a tensor of shape [1, 4]
-                    x1, y1, x2, y2 = box.xyxy[0].int().tolist()
-                    cls = int(box.cls[0])
-                    label = self.class_names.get(cls, str(cls)) if isinstance(self.class_names, dict) else self.class_names[cls]
-                    
-                    detections.append({
-                        'bbox': (x1, y1, x2, y2),
-                        'confidence': conf,
-                        'class': label,
-                        'class_id': cls
-                    })
+            detections.extend(self._parse_result(r, threshold))
         
         return detections
     
+    def detect_batch(self, frames, profiles=None):
+        """Detect traffic signs in a list of frames with one model call"""
+        thresholds = [self._threshold(p) for p in (profiles or [None] * len(frames))]
+        # Run at the loosest threshold in the batch, then filter per frame
+        results = self.model(frames, conf=min(thresholds))
+        return [self._parse_result(r, t) for r, t in zip(results, thresholds)]
+    
+    def _threshold(self, profile):
+        return profile.sign_confidence_threshold if profile is not None else config.SIGN_CONFIDENCE_THRESHOLD
+    
+    def _parse_result(self, r, threshold):
+        """Convert one ultralytics result into detection dicts"""
+        detections = []
+        for box in r.boxes:
+            # Confidence and class
+            conf = float(box.conf[0])
+            if conf > threshold:
+                # xyxy comes as a tensor of shape [1, 4]
+                x1, y1, x2, y2 = box.xyxy[0].int().tolist()
+                cls = int(box.cls[0])
+                label = self.class_names.get(cls, str(cls)) if isinstance(self.class_names, dict) else self.class_names[cls]
+                
+                detections.append({
+                    'bbox': (x1, y1, x2, y2),
+                    'confidence': conf,
+                    'class': label,
+                    'class_id': cls
+                })
+        return detections
+    
     def annotate_frame(self, frame, results):
         """Annotate frame with enhanced, color-coded detection labels"""
         annotated = frame.copy()
@@ -49,6 +49,27 @@ def calculate_metrics(lane_results, frame_shape):
     'right_curvature': float(right_curverad)
     }
 
+def scaled_size(width, height, target_width):
+    """Frame size for target_width keeping aspect ratio (even dimensions for the encoder)"""
+    if not target_width or target_width >= width:
+        return width, height
+    target_height = int(round(height * target_width / width / 2)) * 2
+    return int(target_width) // 2 * 2, max(2, target_height)
+
+def scale_detections(detections, sx, sy):
+    """Map detection boxes from analysis to output coordinates"""
+    if sx == 1 and sy == 1:
+        return detections
+    scaled = []
+    for det in detections:
+        x1, y1, x2, y2 = det['bbox']
+        scaled.append({**det, 'bbox': (int(x1 * sx), int(y1 * sy), int(x2 * sx), int(y2 * sy))})
+    return scaled
+
+def scale_lane_fit(fit, sx, sy):
+    """Map x = a*y^2 + b*y + c from analysis to output pixels (x' = sx*x, y' = sy*y)"""
+    return np.array([fit[0] * sx / sy**2, fit[1] * sx / sy, fit[2] * sx])
+
 def draw_overlay(frame, results, frame_count):
     """Draw performance metrics and alerts on frame"""
     overlay = frame.copy()
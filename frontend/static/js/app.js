@@ -3,6 +3,7 @@ const fileInput = document.getElementById('fileInput');
 const jobsList = document.getElementById('jobsList');
 const resultVideo = document.getElementById('resultVideo');
 const videoPlaceholder = document.getElementById('videoPlaceholder');
+const profileSelect = document.getElementById('profileSelect');
 
 // State
 let jobs = [];
@@ -35,6 +36,7 @@ async function handleUpload(file) {
 
     const formData = new FormData();
     formData.append('file', file);
+    formData.append('profile', profileSelect.value);
 
     try {
         const res = await fetch('/api/upload', {
@@ -130,7 +132,7 @@ async function pollJob(id) {
                 renderJobs();
             }
 
-            if (data.status === 'completed' || data.status === 'failed') {
+            if (data.status === 'completed' || data.status === 'failed' || data.status === 'cancelled') {
                 clearInterval(interval);
                 if (data.status === 'completed' && !activeJobId) {
                     selectJob(id); // Auto-select first completed job
@@ -0,0 +1,100 @@
+import sys
+import types
+import importlib.util
+import cv2
+import numpy as np
+import pytest
+from backend import config
+
+class _Coords:
+    """Stands in for the [1, 4] tensor ultralytics returns for box.xyxy"""
+    def __init__(self, values):
+        self.values = values
+
+    def int(self):
+        return self
+
+    def tolist(self):
+        return list(self.values)
+
+class FakeYOLO:
+    """One fixed detection per frame, placed relative to the frame size"""
+    names = {0: 'stop sign'}
+
+    def __init__(self, model_path=None):
+        pass
+
+    def __call__(self, frames, conf=0.5):
+        if isinstance(frames, np.ndarray):
+            frames = [frames]
+        results = []
+        for frame in frames:
+            h, w = frame.shape[:2]
+            box = types.SimpleNamespace(conf=[0.9], cls=[0], xyxy=[_Coords((w // 4, h // 4, w // 2, h // 2))])
+            results.append(types.SimpleNamespace(boxes=[box]))
+        return results
+
+# The detector module imports ultralytics at load time; the tests never use a real model
+if importlib.util.find_spec('ultralytics') is None:
+    sys.modules['ultralytics'] = types.SimpleNamespace(YOLO=FakeYOLO)
+
+@pytest.fixture
+def fake_yolo(monkeypatch):
+    from backend import traffic_sign_detector
+    monkeypatch.setattr(traffic_sign_detector, 'YOLO', FakeYOLO)
+    # Forked workers inherit the patched detector; spawn would re-import the real one
+    monkeypatch.setattr(config, 'ANALYSIS_START_METHOD', 'fork')
+    monkeypatch.setattr(config, 'USE_INFERENCE_SERVER', False)
+
+def synthetic_frame(i, width, height):
+    """
+    Road with two gently curving lanes, right of centre so the vehicle offset is
+    non-zero, plus a block that moves every frame.
+    The lanes are drawn in the bird's-eye view and warped back with the detector's
+    own transform, so every resolution sees the same road.
+    """
+    from backend.lane_detector import LaneDetector
+    _, Minv = LaneDetector()._get_perspective_transform(width, height)
+
+    birdseye = np.zeros((height, width, 3), dtype=np.uint8)
+    y = np.arange(height)
+    bend = 0.15 * width * ((height - y) / height) ** 2
+    for base in (0.30, 0.80):
+        pts = np.stack([base * width + bend, y], axis=1).astype(np.int32)
+        cv2.polylines(birdseye, [pts], False, (255, 255, 255), max(2, width // 60))
+
+    frame = np.full((height, width, 3), 40, dtype=np.uint8)
+    road = cv2.warpPerspective(birdseye, Minv, (width, height))
+    frame[road[..., 0] > 127] = 255
+    x = width * i // 32 % width
+    cv2.rectangle(frame, (x, height // 10), (x + width // 8, height // 3), (0, 0, 255), -1)
+    return frame
+
+@pytest.fixture
+def make_clip(tmp_path):
+    def make(width=160, height=96, frames=24, motion=None):
+        """motion: optional function(frame_index) -> block step, e.g. to hold the scene still"""
+        path = tmp_path / f"clip_{width}x{height}.avi"
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 10, (width, height))
+        assert writer.isOpened()
+        for i in range(frames):
+            writer.write(synthetic_frame(motion(i) if motion else i, width, height))
+        writer.release()
+        return str(path)
+    return make
+
+@pytest.fixture
+def run_processor(tmp_path):
+    """process_video on a clip; returns (stats, [(frame_index, record), ...])"""
+    def run(clip, parallel=False, profile=None, name="out"):
+        from backend.processor import VideoProcessor
+        records = []
+        stats = VideoProcessor().process_video(
+            clip, str(tmp_path / f"{name}.mp4"),
+            events_path=str(tmp_path / f"{name}_events.json"),
+            parallel=parallel,
+            frame_callback=lambda i, record: records.append((i, record)),
+            profile=profile
+        )
+        return stats, records
+    return run
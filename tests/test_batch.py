@@ -0,0 +1,24 @@
+import json
+import pytest
+from backend import batch
+
+pytestmark = pytest.mark.usefixtures('fake_yolo')
+
+def test_resume_is_per_profile(make_clip, tmp_path):
+    clip = make_clip(frames=6)
+    output_dir = str(tmp_path / "out")
+
+    fast = batch.run_batch([clip], output_dir, profile='fast')
+    assert (fast['processed'], fast['skipped']) == (1, 0)
+
+    # Files done with another profile are not treated as finished
+    accurate = batch.run_batch([clip], output_dir, profile='accurate')
+    assert (accurate['processed'], accurate['skipped']) == (1, 0)
+    assert accurate['files'][0]['output'] != fast['files'][0]['output']
+
+    again = batch.run_batch([clip], output_dir, profile='fast')
+    assert (again['processed'], again['skipped']) == (0, 1)
+
+    with open(tmp_path / "out" / "manifest.jsonl") as f:
+        keys = [json.loads(line)['key'] for line in f]
+    assert len(set(keys)) == 2
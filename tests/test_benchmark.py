@@ -0,0 +1,73 @@
+import pytest
+from backend import config, benchmark
+from backend.inference_server import InferenceServer
+from backend.processor import VideoProcessor
+
+pytestmark = pytest.mark.usefixtures('fake_yolo')
+
+@pytest.fixture
+def seen_configs(monkeypatch):
+    """Config each process_video call ran under"""
+    seen = []
+    original = VideoProcessor.process_video
+
+    def process_video(self, *args, **kwargs):
+        seen.append({
+            'PROXY_ANALYSIS_WIDTH': config.PROXY_ANALYSIS_WIDTH,
+            'STATIC_SCENE_REUSE': config.STATIC_SCENE_REUSE,
+            'server': isinstance(self.traffic_detector, InferenceServer)
+        })
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(VideoProcessor, 'process_video', process_video)
+    return seen
+
+def test_candidates_run_production_defaults(make_clip, seen_configs, monkeypatch):
+    monkeypatch.setattr(config, 'USE_INFERENCE_SERVER', True)
+    monkeypatch.setattr(config, 'STATIC_SCENE_REUSE', True)
+    clip = make_clip(640, 360, frames=12)
+
+    report = benchmark.run_benchmark([clip], {'production': {}, 'proxy': {'PROXY_ANALYSIS_WIDTH': 320}})
+
+    reference, production, proxy = seen_configs
+    assert reference == {'PROXY_ANALYSIS_WIDTH': None, 'STATIC_SCENE_REUSE': False, 'server': False}
+    assert production == {'PROXY_ANALYSIS_WIDTH': None, 'STATIC_SCENE_REUSE': True, 'server': True}
+    assert proxy == {'PROXY_ANALYSIS_WIDTH': 320, 'STATIC_SCENE_REUSE': True, 'server': True}
+    assert report['reference'] == benchmark.DEFAULT_REFERENCE
+
+    # Lane metrics are compared in source pixels, so the proxy run is not penalised for its resolution
+    lane = report['inputs'][0]['candidates']['proxy']['lane']
+    assert lane['coverage'] == 1.0
+    assert lane['offset_mae_m'] < 0.02
+    assert lane['curvature_median_rel_error'] < 0.2
+
+def test_reference_analyses_every_frame(make_clip, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PROCESSING_SKIP_FRAMES', 3)
+    clip = make_clip(frames=12)
+
+    ref_stats, ref_records = benchmark.run_configuration(clip, benchmark.DEFAULT_REFERENCE, str(tmp_path))
+    stats, _ = benchmark.run_configuration(clip, {}, str(tmp_path))
+
+    assert ref_stats['skipped_frames'] == 0 and ref_stats['reused_frames'] == 0
+    assert len(ref_records) == 12
+    assert stats['skipped_frames'] == 8
+
+def test_lane_offset_mae_is_weighted_by_matched_frames(monkeypatch):
+    # Input 'a': 9 frames off by 0.1 m; input 'b': 1 frame off by 0.5 m
+    def record(offset):
+        fit = [0.0, 0.0, 50.0]
+        return {'detections': [], 'left_fit': fit, 'right_fit': fit, 'offset': offset, 'curvature': 1000.0}
+
+    lengths = {'a': 9, 'b': 1}
+    errors = {'a': 0.1, 'b': 0.5}
+
+    def run_configuration(input_path, overrides, work_dir):
+        offset = 0.0 if overrides == benchmark.DEFAULT_REFERENCE else errors[input_path]
+        records = [record(offset) for _ in range(lengths[input_path])]
+        return {'frames': len(records), 'fps': 10.0, 'source_size': (160, 96)}, records
+
+    monkeypatch.setattr(benchmark, 'run_configuration', run_configuration)
+    monkeypatch.setattr(benchmark, 'source_metrics', lambda record, frame_size: record)
+    report = benchmark.run_benchmark(['a', 'b'], {'candidate': {'PROCESSING_SKIP_FRAMES': 2}})
+
+    assert report['candidates']['candidate']['lane_offset_mae_m'] == pytest.approx((9 * 0.1 + 0.5) / 10)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from backend import config, encoder
+
+@pytest.fixture
+def opencv_only(monkeypatch):
+    monkeypatch.setattr(config, 'USE_FFMPEG_ENCODER', False)
+
+def test_falls_back_to_second_fourcc(opencv_only, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'OPENCV_FOURCC', 'ZZZZ')
+    monkeypatch.setattr(config, 'OPENCV_FALLBACK_FOURCC', 'mp4v')
+    output = tmp_path / "out.mp4"
+    writer = encoder.create_writer(output, 30, (64, 48))
+    assert writer.isOpened()
+    writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+    writer.release()
+    assert output.stat().st_size > 0
+
+def test_raises_when_no_writer_opens(opencv_only, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'OPENCV_FOURCC', 'ZZZZ')
+    monkeypatch.setattr(config, 'OPENCV_FALLBACK_FOURCC', 'ZZZZ')
+    with pytest.raises(RuntimeError):
+        encoder.create_writer(tmp_path / "out.mp4", 30, (64, 48))
+
+def test_raises_for_unwritable_path(opencv_only, tmp_path):
+    with pytest.raises(RuntimeError):
+        encoder.create_writer(tmp_path / "missing" / "out.mp4", 30, (64, 48))
+
+class FakeProcess:
+    def __init__(self, cmd, **kwargs):
+        self.cmd = cmd
+
+def test_ffmpeg_transcodes_audio(monkeypatch, tmp_path):
+    monkeypatch.setattr(encoder.subprocess, 'Popen', FakeProcess)
+    writer = encoder.FFmpegWriter(tmp_path / "out.mp4", 30, (64, 48), audio_source="in.avi")
+    cmd = writer.process.cmd
+    audio_codec = cmd[cmd.index('-c:a') + 1]
+    assert audio_codec == config.ENCODER_AUDIO_CODEC != 'copy'
+
+def test_ffmpeg_pads_to_even_dimensions(monkeypatch, tmp_path):
+    monkeypatch.setattr(encoder.subprocess, 'Popen', FakeProcess)
+    writer = encoder.FFmpegWriter(tmp_path / "out.mp4", 30, (641, 361))
+    cmd = writer.process.cmd
+    assert cmd[cmd.index('-vf') + 1] == 'pad=ceil(iw/2)*2:ceil(ih/2)*2'
+    # Raw input keeps the true frame size
+    assert cmd[cmd.index('-s') + 1] == '641x361'
+
+@pytest.mark.parametrize('fps', [0, -1, None])
+def test_invalid_fps_falls_back_to_target(monkeypatch, tmp_path, fps):
+    monkeypatch.setattr(config, 'USE_FFMPEG_ENCODER', True)
+    monkeypatch.setattr(encoder, 'ffmpeg_available', lambda: True)
+    monkeypatch.setattr(encoder.subprocess, 'Popen', FakeProcess)
+    writer = encoder.create_writer(tmp_path / "out.mp4", fps, (64, 48))
+    cmd = writer.process.cmd
+    assert cmd[cmd.index('-r') + 1] == str(config.TARGET_FPS)
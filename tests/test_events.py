@@ -0,0 +1,78 @@
+import pytest
+from backend import config
+from backend.events import EventIndex, EventBuilder
+
+def event(event_type, start, end, **data):
+    return {'type': event_type, 'start': start, 'end': end,
+            'start_frame': int(start * 10), 'end_frame': int(end * 10), 'data': data}
+
+@pytest.fixture
+def index():
+    return EventIndex([
+        event('object', 0.0, 60.0, **{'class': 'car', 'detections': 300}),  # long, starts early
+        event('lane_departure', 10.0, 12.0, side='left', peak_offset=-0.8),
+        event('object', 20.0, 21.0, **{'class': 'stop sign', 'detections': 5}),
+        event('sharp_curve', 30.0, 35.0, min_curvature=200.0),
+    ])
+
+def spans(events):
+    return [(e['type'], e['start']) for e in events]
+
+def test_range_query_includes_events_that_started_earlier(index):
+    # The 60 s car event starts long before the range but overlaps it
+    assert spans(index.query(40.0, 50.0)) == [('object', 0.0)]
+    assert spans(index.query(11.0, 20.0)) == [('object', 0.0), ('lane_departure', 10.0), ('object', 20.0)]
+
+def test_range_query_bounds_are_inclusive(index):
+    assert ('lane_departure', 10.0) in spans(index.query(12.0, 15.0))
+    assert ('sharp_curve', 30.0) in spans(index.query(25.0, 30.0))
+    assert ('lane_departure', 10.0) not in spans(index.query(12.5, 15.0))
+
+def test_open_ended_queries(index):
+    assert len(index.query()) == 4
+    assert spans(index.query(start=33.0)) == [('object', 0.0), ('sharp_curve', 30.0)]
+    assert spans(index.query(end=5.0)) == [('object', 0.0)]
+
+def test_type_and_label_filters(index):
+    assert spans(index.query(types=['sharp_curve', 'lane_departure'])) == [('lane_departure', 10.0), ('sharp_curve', 30.0)]
+    assert spans(index.query(label='stop sign')) == [('object', 20.0)]
+    assert index.query(15.0, 19.0, label='stop sign') == []
+
+def test_add_keeps_order_and_widens_lookback():
+    index = EventIndex()
+    index.add(event('object', 5.0, 6.0, **{'class': 'car'}))
+    index.add(event('sharp_curve', 1.0, 100.0))
+    assert spans(index.query(90.0, 95.0)) == [('sharp_curve', 1.0)]
+    assert [e['start'] for e in index.events] == [1.0, 5.0]
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = tmp_path / "events.json"
+    index.save(path)
+    loaded = EventIndex.load(path)
+    assert loaded.events == index.events
+    assert spans(loaded.query(40.0, 50.0)) == [('object', 0.0)]
+
+def departure(offset=-1.0):
+    return {'offset': offset, 'curvature': 10_000.0}
+
+def test_builder_merges_within_gap_and_splits_beyond(monkeypatch):
+    monkeypatch.setattr(config, 'LANE_OFFSET_THRESHOLD', 0.5)
+    builder = EventBuilder(merge_gap=0.5)
+    # Departing 0.0-1.0, back in lane briefly (0.4 s, merged), then out again after 1.6 s (split)
+    for t, offset in [(0.0, -1.0), (0.5, -1.2), (1.0, -0.9), (1.2, 0.0), (1.4, -1.0), (2.0, 0.0), (3.0, -0.8)]:
+        builder.update(t, int(t * 10), departure(offset), [])
+    index = builder.finalize()
+
+    events = index.query(types=['lane_departure'])
+    assert [(e['start'], e['end']) for e in events] == [(0.0, 1.4), (3.0, 3.0)]
+    assert events[0]['data'] == {'side': 'left', 'peak_offset': -1.2}
+
+def test_builder_counts_only_analysed_detections():
+    builder = EventBuilder()
+    car = [{'class': 'car', 'bbox': (0, 0, 1, 1), 'confidence': 0.9}]
+    for frame in range(40):
+        # Every 10th frame analysed, the rest carry the last detections forward
+        builder.update(frame / 10, frame, None, car, analysed=frame % 10 == 0)
+    (obj,) = builder.finalize().query(types=['object'])
+    assert obj['data'] == {'class': 'car', 'detections': 4}
+    assert (obj['start_frame'], obj['end_frame']) == (0, 39)
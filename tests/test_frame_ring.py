@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from backend import config
+from backend.profiles import ProcessingProfile
+from backend.frame_ring import FrameRing
+
+pytestmark = pytest.mark.usefixtures('fake_yolo')
+
+FRAMES = 24
+
+def test_run_hands_back_every_frame_in_order():
+    frames = [np.full((96, 160, 3), i, dtype=np.uint8) for i in range(FRAMES)]
+    source = iter(frames)
+    seen = []
+
+    def handle_result(frame_index, frame, sign_results, lane_results):
+        seen.append((frame_index, int(frame[0, 0, 0]), sign_results is not None))
+
+    with FrameRing((96, 160, 3), ProcessingProfile(), workers=2, slots=3) as ring:
+        done = ring.run(lambda: next(source, None), handle_result,
+                        lambda frame_index, frame: frame_index % 3 == 0)
+
+    assert done == FRAMES
+    assert seen == [(i, i, i % 3 == 0) for i in range(FRAMES)]
+
+@pytest.mark.parametrize('skip_frames', [1, 2])
+def test_parallel_matches_sequential(make_clip, run_processor, tmp_path, monkeypatch, skip_frames):
+    monkeypatch.setattr(config, 'ANALYSIS_WORKERS', 2)
+    clip = make_clip(frames=FRAMES)
+    profile = ProcessingProfile(skip_frames=skip_frames, static_reuse=False)
+
+    seq_stats, seq_records = run_processor(clip, False, profile, name="sequential")
+    par_stats, par_records = run_processor(clip, True, profile, name="parallel")
+
+    assert seq_stats['frames'] == par_stats['frames'] == FRAMES
+    assert [i for i, _ in par_records] == list(range(FRAMES))
+    assert par_records == seq_records
+    assert all(record['detections'] for _, record in par_records)
+    assert any(record['left_fit'] for _, record in par_records)
+    assert (tmp_path / "parallel.mp4").stat().st_size > 0
+
+def test_bypassed_frames_do_not_read_ahead_unbounded():
+    counts = {'read': 0, 'emitted': 0, 'ahead': 0}
+    seen = []
+
+    def read_frame():
+        if counts['read'] == FRAMES:
+            return None
+        frame = np.full((96, 160, 3), counts['read'], dtype=np.uint8)
+        counts['read'] += 1
+        counts['ahead'] = max(counts['ahead'], counts['read'] - counts['emitted'])
+        return frame
+
+    def handle_result(frame_index, frame, sign_results, lane_results):
+        seen.append((frame_index, int(frame[0, 0, 0])))
+        counts['emitted'] += 1
+
+    # Mostly static: only every 10th frame goes to the workers
+    with FrameRing((96, 160, 3), ProcessingProfile(), workers=1, slots=2, max_pending=4) as ring:
+        ring.run(read_frame, handle_result, lambda frame_index, frame: frame_index % 10 == 0)
+
+    assert seen == [(i, i) for i in range(FRAMES)]
+    assert counts['ahead'] <= 4
+
+def test_failed_pool_setup_releases_shared_memory(monkeypatch):
+    from backend import frame_ring
+    created = []
+
+    class RecordingSharedMemory(frame_ring.shared_memory.SharedMemory):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self.name)
+
+    monkeypatch.setattr(frame_ring.shared_memory, 'SharedMemory', RecordingSharedMemory)
+    monkeypatch.setattr(config, 'ANALYSIS_START_METHOD', 'no-such-method')
+    with pytest.raises(ValueError):
+        with FrameRing((96, 160, 3), ProcessingProfile(), workers=1, slots=2):
+            pass
+
+    assert len(created) == 1
+    with pytest.raises(FileNotFoundError):
+        frame_ring._attach(created[0])
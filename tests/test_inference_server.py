@@ -0,0 +1,63 @@
+import time
+import threading
+import numpy as np
+import pytest
+from backend.inference_server import InferenceServer
+
+class RecordingDetector:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def detect_batch(self, frames, profiles=None):
+        self.batch_sizes.append(len(frames))
+        return [[] for _ in frames]
+
+@pytest.fixture
+def detector():
+    return RecordingDetector()
+
+@pytest.fixture
+def frame():
+    return np.zeros((8, 8, 3), dtype=np.uint8)
+
+def timed_detect(session, frame):
+    start = time.monotonic()
+    session.detect(frame)
+    return time.monotonic() - start
+
+def test_lone_session_does_not_wait(detector, frame):
+    server = InferenceServer(detector, max_batch_size=8, max_wait_ms=500)
+    try:
+        with server.session() as session:
+            assert timed_detect(session, frame) < 0.25
+    finally:
+        server.close()
+
+def test_idle_session_is_not_waited_for(detector, frame):
+    server = InferenceServer(detector, max_batch_size=8, max_wait_ms=500, client_idle_ms=50)
+    try:
+        # e.g. a paused job that still holds its session
+        with server.session(), server.session() as active:
+            time.sleep(0.1)
+            assert timed_detect(active, frame) < 0.25
+    finally:
+        server.close()
+
+def test_active_sessions_are_batched_together(detector, frame):
+    server = InferenceServer(detector, max_batch_size=8, max_wait_ms=500)
+    barrier = threading.Barrier(3)
+
+    def client(session):
+        barrier.wait()
+        session.detect(frame)
+
+    try:
+        with server.session() as a, server.session() as b, server.session() as c:
+            threads = [threading.Thread(target=client, args=(s,)) for s in (a, b, c)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join(2)
+    finally:
+        server.close()
+    assert detector.batch_sizes == [3]
@@ -0,0 +1,169 @@
+import time
+import threading
+import pytest
+from backend.jobs import JobScheduler, JobCancelled
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+class DummyJob:
+    """fn(control) that checkpoints like the frame loop until released"""
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.finished = threading.Event()
+        self.cancelled = False
+
+    def __call__(self, control):
+        self.started.set()
+        try:
+            while not self.release.is_set():
+                control.checkpoint()
+                time.sleep(0.002)
+            # One last checkpoint so a paused job cannot finish until it holds a slot again
+            control.checkpoint()
+        except JobCancelled:
+            self.cancelled = True
+        finally:
+            self.finished.set()
+
+@pytest.fixture
+def scheduler():
+    return JobScheduler(max_concurrent=1, preemption=True)
+
+def test_queued_jobs_run_in_priority_order():
+    running, low, high = DummyJob(), DummyJob(), DummyJob()
+    scheduler = JobScheduler(max_concurrent=1, preemption=False)
+    scheduler.submit('running', running, 'normal')
+    assert running.started.wait(1)
+
+    scheduler.submit('low', low, 'low')
+    scheduler.submit('high', high, 'high')
+    assert not low.started.is_set() and not high.started.is_set()
+
+    running.release.set()
+    assert high.started.wait(1)
+    assert not low.started.is_set()
+
+    high.release.set()
+    assert low.started.wait(1)
+    low.release.set()
+    assert low.finished.wait(1)
+
+def test_higher_priority_job_preempts_and_preempted_job_resumes(scheduler):
+    low, high = DummyJob(), DummyJob()
+    scheduler.submit('low', low, 'low')
+    assert low.started.wait(1)
+
+    scheduler.submit('high', high, 'high')
+    assert high.started.wait(1)
+    low_control = scheduler.get_control('low')
+    assert low_control.preempted and low_control.paused
+    assert scheduler._active == {'high'} and scheduler._preempted == {'low'}
+
+    # The preempted job stays parked even if its work is otherwise done
+    low.release.set()
+    assert not low.finished.wait(0.1)
+
+    high.release.set()
+    assert wait_for(lambda: not low_control.paused)
+    assert low.finished.wait(1)
+    assert not low.cancelled
+
+def test_equal_priority_does_not_preempt(scheduler):
+    first, second = DummyJob(), DummyJob()
+    scheduler.submit('first', first, 'normal')
+    assert first.started.wait(1)
+    scheduler.submit('second', second, 'normal')
+    assert not second.started.wait(0.1)
+    assert not scheduler.get_control('first').paused
+
+    first.release.set()
+    assert second.started.wait(1)
+    second.release.set()
+    assert second.finished.wait(1)
+
+def test_pause_frees_slot_and_resume_waits_for_one(scheduler):
+    paused, queued = DummyJob(), DummyJob()
+    scheduler.submit('paused', paused, 'normal')
+    assert paused.started.wait(1)
+
+    scheduler.submit('queued', queued, 'normal')
+    assert scheduler.pause('paused')
+    assert queued.started.wait(1)
+    assert scheduler._suspended == {'paused'}
+
+    # Resuming while the slot is taken parks the job as preempted
+    assert scheduler.resume('paused')
+    control = scheduler.get_control('paused')
+    assert control.paused and not control.user_paused
+    assert scheduler._preempted == {'paused'}
+
+    queued.release.set()
+    assert wait_for(lambda: not control.paused)
+    assert scheduler._active == {'paused'}
+    paused.release.set()
+    assert paused.finished.wait(1)
+
+def test_resume_requires_a_paused_job(scheduler):
+    job = DummyJob()
+    scheduler.submit('job', job, 'normal')
+    assert job.started.wait(1)
+    assert not scheduler.resume('job')
+    assert not scheduler.resume('unknown')
+    job.release.set()
+    assert job.finished.wait(1)
+
+def test_cancel_while_queued_never_starts(scheduler):
+    running, queued = DummyJob(), DummyJob()
+    scheduler.submit('running', running, 'normal')
+    assert running.started.wait(1)
+    scheduler.submit('queued', queued, 'normal')
+
+    assert scheduler.is_queued('queued')
+    assert scheduler.cancel('queued') == 'queued'
+    assert not scheduler.is_queued('queued')
+    assert scheduler.get_control('queued') is None
+
+    running.release.set()
+    assert running.finished.wait(1)
+    assert wait_for(lambda: not scheduler._active)
+    assert not queued.started.is_set()
+    assert scheduler.cancel('queued') is None
+
+def test_cancel_running_and_paused_jobs(scheduler):
+    running = DummyJob()
+    scheduler.submit('running', running, 'normal')
+    assert running.started.wait(1)
+    assert scheduler.pause('running')
+
+    # Cancelling wakes the paused loop so it can exit
+    assert scheduler.cancel('running') == 'running'
+    assert running.finished.wait(1)
+    assert running.cancelled
+    assert wait_for(lambda: not scheduler._suspended and scheduler.get_control('running') is None)
+
+def test_cancel_dispatched_job_before_it_runs():
+    # The job holds a slot but its thread has not reached the frame loop yet
+    gate = threading.Event()
+    ran = []
+
+    def fn(control):
+        gate.wait(1)
+        try:
+            control.checkpoint()
+            ran.append('processed')
+        except JobCancelled:
+            ran.append('cancelled')
+
+    scheduler = JobScheduler(max_concurrent=1, preemption=False)
+    scheduler.submit('job', fn, 'normal')
+    assert not scheduler.is_queued('job')
+    assert scheduler.cancel('job') == 'running'
+    gate.set()
+    assert wait_for(lambda: ran == ['cancelled'])
@@ -0,0 +1,58 @@
+import os
+import json
+import cv2
+import numpy as np
+import pytest
+from backend import config
+from backend.previews import PreviewBuilder
+
+def frame(i):
+    return np.full((90, 160, 3), i % 256, dtype=np.uint8)
+
+def build(tmp_path, fps, total_frames, frames):
+    builder = PreviewBuilder(tmp_path, fps, total_frames, (160, 90))
+    for i in range(frames):
+        builder.add(frame(i), i)
+    return builder, builder.finalize()
+
+def test_samples_every_interval_and_writes_layout(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PREVIEW_INTERVAL_SECONDS', 2.0)
+    monkeypatch.setattr(config, 'PREVIEW_SPRITE_COLUMNS', 4)
+    builder, manifest = build(tmp_path, 10, 100, 100)
+
+    assert manifest['interval_frames'] == 20
+    assert [t['frame'] for t in manifest['thumbnails']] == [0, 20, 40, 60, 80]
+    assert [t['time'] for t in manifest['thumbnails']] == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert (manifest['sprite_columns'], manifest['sprite_rows']) == (4, 2)
+
+    with open(tmp_path / "index.json") as f:
+        assert json.load(f) == manifest
+    tw, th = manifest['thumbnail_size']
+    sprite = cv2.imread(str(tmp_path / "sprite.jpg"))
+    assert sprite.shape[:2] == (2 * th, 4 * tw)
+    assert sorted(os.listdir(tmp_path / "thumbnails")) == [t['file'] for t in manifest['thumbnails']]
+    assert (tmp_path / "poster.jpg").exists()
+
+def test_long_video_widens_interval_up_front(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PREVIEW_MAX_THUMBNAILS', 5)
+    builder = PreviewBuilder(tmp_path, 10, 1000, (160, 90))
+    assert builder.interval == 200
+
+@pytest.mark.parametrize('total_frames', [0, -1])
+def test_unknown_length_is_capped(tmp_path, monkeypatch, total_frames):
+    monkeypatch.setattr(config, 'PREVIEW_INTERVAL_SECONDS', 1.0)
+    monkeypatch.setattr(config, 'PREVIEW_MAX_THUMBNAILS', 4)
+    builder, manifest = build(tmp_path, 10, total_frames, 200)
+
+    thumbnails = manifest['thumbnails']
+    assert len(thumbnails) <= 4
+    # Still spread over the whole clip, evenly spaced
+    frames = [t['frame'] for t in thumbnails]
+    assert frames == list(range(0, 200, manifest['interval_frames']))
+    assert frames[-1] >= 100
+    assert [t['index'] for t in thumbnails] == list(range(len(thumbnails)))
+    assert sorted(os.listdir(tmp_path / "thumbnails")) == [t['file'] for t in thumbnails]
+    # Renumbered files hold the frames their entries claim
+    for t in thumbnails:
+        img = cv2.imread(str(tmp_path / "thumbnails" / t['file']))
+        assert abs(int(img.mean()) - t['frame'] % 256) <= 2
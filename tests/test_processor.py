@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from backend.profiles import ProcessingProfile
+
+pytestmark = pytest.mark.usefixtures('fake_yolo')
+
+def lane_metrics(records):
+    offsets = [r['offset'] for _, r in records if r['offset'] is not None]
+    curvatures = [r['curvature'] for _, r in records if r['curvature'] is not None]
+    return np.mean(offsets), np.median(curvatures)
+
+def test_metrics_do_not_depend_on_proxy_width(make_clip, run_processor):
+    clip = make_clip(640, 360, frames=12)
+    full_stats, full = run_processor(clip, profile=ProcessingProfile(static_reuse=False), name="full")
+    proxy_stats, proxy = run_processor(clip, profile=ProcessingProfile(proxy_width=320, static_reuse=False), name="proxy")
+    assert proxy_stats['analysis_size'] == (320, 180)
+
+    full_offset, full_curvature = lane_metrics(full)
+    proxy_offset, proxy_curvature = lane_metrics(proxy)
+    assert proxy_offset == pytest.approx(full_offset, rel=0.2, abs=0.02)
+    assert proxy_curvature == pytest.approx(full_curvature, rel=0.2)
+
+def test_object_events_count_only_analysed_frames(make_clip, run_processor, tmp_path):
+    from backend.events import EventIndex
+    clip = make_clip(frames=12)
+    run_processor(clip, profile=ProcessingProfile(skip_frames=3, static_reuse=False), name="skip")
+
+    (obj,) = EventIndex.load(tmp_path / "skip_events.json").query(types=['object'])
+    assert obj['data']['detections'] == 4
+    assert (obj['start_frame'], obj['end_frame']) == (0, 11)
+
+def test_static_reuse_still_analyses_local_motion(make_clip, run_processor):
+    # Stopped vehicle; only a small block moves in frames 30-39
+    clip = make_clip(frames=50, motion=lambda i: i if 30 <= i < 40 else 0)
+
+    stats, records = run_processor(clip, profile=ProcessingProfile(static_max_reuse=100), name="static")
+    # Frame 0, the ten moving frames and frame 40 (block back in place) are analysed
+    assert stats['reused_frames'] == 50 - 12
+    assert stats['skipped_frames'] == 0
+    assert len(records) == 50
@@ -0,0 +1,31 @@
+import pytest
+from backend import config
+from backend.profiles import ProcessingProfile, get_profile
+
+def test_defaults_follow_config(monkeypatch):
+    monkeypatch.setattr(config, 'NWINDOWS', 7)
+    monkeypatch.setattr(config, 'STATIC_SCENE_MAX_REUSE', 12)
+
+    profile = ProcessingProfile()
+    assert profile == ProcessingProfile.from_config()
+    assert profile.nwindows == 7 and profile.static_max_reuse == 12
+    assert profile.name == 'config'
+
+def test_overrides_keep_the_neutral_name():
+    profile = ProcessingProfile.from_config(skip_frames=4)
+    assert profile.name == 'config'
+    assert profile.skip_frames == 4
+    assert profile.margin == config.MARGIN
+
+def test_named_profile_applies_its_overrides(monkeypatch):
+    monkeypatch.setitem(config.PROCESSING_PROFILES, 'custom', {'margin': 40})
+    profile = get_profile('custom')
+    assert profile.name == 'custom'
+    assert profile.margin == 40
+    assert profile.nwindows == config.NWINDOWS
+
+def test_invalid_values_are_rejected():
+    with pytest.raises(ValueError):
+        ProcessingProfile(skip_frames=0)
+    with pytest.raises(ValueError):
+        get_profile('missing')
@@ -0,0 +1,32 @@
+import cv2
+import numpy as np
+from backend.scene_change import StaticSceneDetector
+
+def scene(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(60, 200, (360, 640, 3), dtype=np.uint8)
+
+def test_sensor_noise_is_static():
+    base = scene()
+    noisy = np.clip(base + np.random.default_rng(1).normal(0, 3, base.shape), 0, 255).astype(np.uint8)
+    detector = StaticSceneDetector(threshold=1.5, max_reuse=30)
+    assert not detector.is_static(base, 0)
+    assert detector.is_static(noisy, 1)
+
+def test_local_motion_is_not_averaged_away():
+    base = scene()
+    pedestrian = base.copy()
+    cv2.rectangle(pedestrian, (500, 200), (520, 245), (20, 20, 20), -1)
+    detector = StaticSceneDetector(threshold=1.5, max_reuse=30)
+    assert not detector.is_static(base, 0)
+
+    # The change is tiny over the whole frame but dominates its block
+    whole_frame = np.mean(np.abs(detector._signature(pedestrian) - detector._reference))
+    assert whole_frame < detector.threshold
+    assert not detector.is_static(pedestrian, 1)
+
+def test_max_reuse_counts_source_frames():
+    # Only every third frame is checked, as with skip_frames=3
+    frame = scene()
+    detector = StaticSceneDetector(threshold=1.5, max_reuse=5)
+    assert [detector.is_static(frame, i) for i in (0, 3, 6, 9, 12)] == [False, True, False, True, False]
@@ -0,0 +1,61 @@
+import os
+import time
+import uuid
+import pytest
+from backend import config
+from backend.storage import StorageManager
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    uploads, outputs = tmp_path / "uploads", tmp_path / "processed"
+    uploads.mkdir()
+    outputs.mkdir()
+    monkeypatch.setattr(config, 'PREVIEW_DIR', tmp_path / "previews")
+    monkeypatch.setattr(config, 'EVENTS_DIR', tmp_path / "events")
+    (tmp_path / "events").mkdir()
+    return uploads, outputs
+
+def write(path, size, age=0):
+    path.write_bytes(b"\0" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+def test_lru_never_evicts_files_of_registered_jobs(dirs):
+    uploads, _ = dirs
+    jobs = {}
+    active, orphan = str(uuid.uuid4()), str(uuid.uuid4())
+    jobs[active] = {'status': 'queued'}
+    active_file = write(uploads / f"{active}_clip.mp4", 600, age=100)
+    orphan_file = write(uploads / f"{orphan}_old.mp4", 600)
+
+    storage = StorageManager(jobs, quotas={str(uploads): 1000}, ttl=0)
+    assert storage.sweep() == 600
+    assert active_file.exists()
+    assert not orphan_file.exists()
+
+def test_expired_result_notifies_and_removes_events(dirs):
+    _, outputs = dirs
+    job_id = str(uuid.uuid4())
+    jobs = {job_id: {'status': 'completed', 'finished_at': time.time() - 100}}
+    write(outputs / f"processed_{job_id}_clip.mp4", 10)
+    events_path = config.EVENTS_DIR / f"{job_id}.json"
+    events_path.write_text("{}")
+
+    expired = []
+    storage = StorageManager(jobs, quotas={str(outputs): None}, ttl=50, on_expire=expired.append)
+    storage.sweep()
+    assert expired == [job_id]
+    assert jobs[job_id]['expired']
+    assert not events_path.exists()
+
+def test_unrelated_files_survive_ttl_and_lru(dirs):
+    uploads, _ = dirs
+    job_id = str(uuid.uuid4())
+    sample = write(uploads / "gettyimages-2245580101-640_adpp.mp4", 600, age=10_000)
+    job_file = write(uploads / f"{job_id}_clip.mp4", 600, age=10_000)
+
+    storage = StorageManager({}, quotas={str(uploads): 100}, ttl=50)
+    storage.sweep()
+    assert sample.exists()
+    assert not job_file.exists()